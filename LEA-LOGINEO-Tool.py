@@ -1,14 +1,13 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import multiprocessing
 import os
 import sys
 import traceback
 
 from modules.io_utils import appdir, print_header, ask_menu, pause
 from modules.settings import load_settings
-from modules.converter import LEAConverter
-from modules.pdf_generator import PDFGenerator
 
 DEBUG = False
 
@@ -60,6 +59,7 @@ def run_cli() -> None:
 
     if choice == 1:
         try:
+            from modules.converter import LEAConverter
             LEAConverter(settings).convert()
         except KeyboardInterrupt:
             print("\nVorgang abgebrochen.")
@@ -94,6 +94,7 @@ def run_cli() -> None:
         print("drücken Sie beliebige Taste, um fortzufahren.")
         input("Andernfalls brechen Sie den Prozess mit [STRG + C] ab.")
         try:
+            from modules.pdf_generator import PDFGenerator
             pdfgen = PDFGenerator(settings)
             xml_path = getattr(settings, 'logineo_xml_file', '').strip() if hasattr(settings, 'logineo_xml_file') else ''
             if xml_path:
@@ -125,4 +126,6 @@ def main() -> None:
     gui_main()
 
 if __name__ == "__main__":
+    # Needed for the GUI job process in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
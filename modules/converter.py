@@ -1,37 +1,86 @@
 ﻿from __future__ import annotations
 
+import csv
+import functools
 import os
 import re
-from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Callable, List
 
+import numpy as np
 import pandas as pd
 
+try:
+    import xlsxwriter  # optional: streamt .xlsx zeilenweise auf die Platte
+except ImportError:  # Fallback: openpyxl über pandas
+    xlsxwriter = None
+
 from .io_utils import resolve_path, ensure_dir, pause
 from .settings import Settings
 from .mapping import LEHRAEMTER, LEHRAMTGRUPPEN
 
 
 _ym_re = re.compile(r"(\d{4})-(\d{2})")
+_ws_re = re.compile(r"\s+")
 
+_FAIL_COLUMNS = ["LEAID", "IdentNr", "Nachname", "Vorname", "Typ", "Lehramt"]
 
-def _extract_year_month(s: str) -> str:
-    if not s:
-        return "???"
-    m = _ym_re.search(s)
-    return f"{m.group(1)}-{m.group(2)}" if m else "???"
+# Spalten des LEA-Exports, die tatsächlich ausgewertet werden
+_SOURCE_COLUMNS = frozenset({
+    "LAA_Logineo", "LAA_IdentNr", "LAA_Name", "LAA_Vorname", "Lehramt", "Lehramtgruppe",
+    "VDVon", "KursSeminarSchluessel", "KursFach1Schluessel", "KursFach2Schluessel",
+})
 
+# Ab dieser Zeilenzahl wird bei XLSX-Ausgabe auf CSV hingewiesen
+_XLSX_WARN_ROWS = 10_000
+_PREVIEW_ROWS = 20
 
-def _read_str(src: pd.Series, col: str) -> str:
-    try:
-        val = src.get(col, "")
-        return "" if val is None else str(val)
-    except Exception:
-        return ""
+
+def _column(df: pd.DataFrame, col: str) -> pd.Series:
+    """Liefert eine Quellspalte als Text; fehlende Spalten ergeben leere Strings."""
+    if col in df.columns:
+        return df[col].astype(str)
+    return pd.Series("", index=df.index, dtype=object)
+
+
+def _to_int_like(values: pd.Series) -> pd.Series:
+    """Toleriert '27' wie auch '27.0'; nicht-numerische Werte werden NaN."""
+    num = pd.to_numeric(values.str.strip(), errors="coerce")
+    return np.trunc(num.where(num.abs() < 2**63))
+
+
+def _normalize_numeric_text(values: pd.Series) -> pd.Series:
+    """
+    Gibt numerische Strings (auch '123.0') als saubere Textwerte zurück.
+    Das verhindert, dass Excel sie später als Gleitkommazahlen speichert
+    und 8-stellige IDs in die wissenschaftliche Notation zwingt.
+    """
+    cleaned = values.str.strip()
+    as_int = _to_int_like(cleaned)
+    return as_int.astype("Int64").astype(str).where(as_int.notna(), cleaned)
 
 
-def _to_int_like(s: str) -> int | None:
+def _extract_year_month(values: pd.Series) -> pd.Series:
+    """
+    LEA liefert VDVon als 'JJJJ-MM' (ggf. mit Tag); diese Werte werden per Slice
+    gelesen. Nur abweichende Formate gehen über die Regex, Rest -> '???'.
+    """
+    head = values.str.slice(0, 7)
+    iso = (
+        (head.str.len() == 7)
+        & (head.str.slice(4, 5) == "-")
+        & head.str.slice(0, 4).str.isdigit()
+        & head.str.slice(5, 7).str.isdigit()
+    )
+    rest = ~iso
+    if rest.any():
+        parts = values[rest].str.extract(_ym_re)
+        head = head.where(iso, (parts[0] + "-" + parts[1]).fillna("???"))
+    return head
+
+
+@functools.lru_cache(maxsize=1024)
+def _code_to_int(s: str) -> int | None:
     """Toleriert '27' wie auch '27.0'."""
     try:
         return int(float(s))
@@ -39,172 +88,178 @@ def _to_int_like(s: str) -> int | None:
         return None
 
 
-def _normalize_numeric_text(value: str) -> str:
+@functools.lru_cache(maxsize=1024)
+def _la_label_for(la_code: str, lag_code: str) -> str:
+    """Lehramtslabel (G, HRSGe, SF, GyGe, BK, ???); 'Lehramt' hat Vorrang vor 'Lehramtgruppe'."""
+    if la_code:
+        return LEHRAEMTER.get(_code_to_int(la_code), "???")
+    if lag_code:
+        return LEHRAMTGRUPPEN.get(_code_to_int(lag_code), "???")
+    return "???"
+
+
+def _lehramt_labels(la_codes: pd.Series, lag_codes: pd.Series) -> pd.Series:
     """
-    Gibt numerische Strings (auch '123.0') als saubere Textwerte zurück.
-    Das verhindert, dass Excel sie später als Gleitkommazahlen speichert
-    und 8-stellige IDs in die wissenschaftliche Notation zwingt.
+    Löst jedes vorkommende Codepaar nur einmal auf und liefert die Label als
+    kategoriale Spalte (wenige eindeutige Strings + Code-Array pro Zeile).
     """
-    if not value:
-        return ""
-    cleaned = value.strip()
-    if not cleaned:
-        return ""
-    as_int = _to_int_like(cleaned)
-    return f"{as_int:d}" if as_int is not None else cleaned
-
-
-@dataclass
-class OutputRow:
-    LEAID: Any = ""
-    IdentNr: str = ""
-    Nachname: str = ""
-    Vorname: str = ""
-    Typ: str = "LAA"
-    Seminar: str = ""
-    Lehramt: str = ""
-    Jahrgang: str = ""
-    Kernseminar: str = ""
-    Fachseminar_1: str = ""
-    Fachseminar_2: str = ""
-
-    @staticmethod
-    def from_source(src: pd.Series, s: Settings) -> "OutputRow":
-        row = OutputRow()
-
-        # LEAID
-        leaid_raw = _read_str(src, "LAA_Logineo")
-        row.LEAID = _normalize_numeric_text(leaid_raw)
-
-        # IdentNr
-        ident = _read_str(src, "LAA_IdentNr")
-        if ident and len(ident) > 9:
-            row.IdentNr = ("0" + ident) if len(ident) == 10 else ident
-        else:
-            row.IdentNr = "IdentNr fehlt"
-
-        # Namen
-        row.Nachname = _read_str(src, "LAA_Name")
-        row.Vorname = _read_str(src, "LAA_Vorname")
-
-        # Lehramtslabel (G, HRSGe, SF, GyGe, BK, ???)
-        la_code = _read_str(src, "Lehramt")
-        lag_code = _read_str(src, "Lehramtgruppe")
-        la_label = "???"
-        if la_code:
-            key = _to_int_like(la_code)
-            la_label = LEHRAEMTER.get(key, "???") if key is not None else "???"
-        elif lag_code:
-            key = _to_int_like(lag_code)
-            la_label = LEHRAMTGRUPPEN.get(key, "???") if key is not None else "???"
-
-        # Seminar & Lehramt (nur wenn aktiviert)
-        if s.lea_gruppe_laa_lehramt == "ja":
-            row.Seminar = f"Seminar_{la_label}" if la_label != "" else "Seminar_???"
-            row.Lehramt = f"LAA_{la_label}" if la_label != "" else "LAA_???"
-        else:
-            row.Seminar = ""
-            row.Lehramt = ""
+    # Paare als MultiIndex faktorisieren (ein Trennzeichen im String kann pandas verschlucken)
+    codes, pairs = pd.MultiIndex.from_arrays([la_codes, lag_codes]).factorize()
+    labels = np.array([_la_label_for(*pair) for pair in pairs], dtype=object)
+    categories, label_codes = np.unique(labels, return_inverse=True)
+    return pd.Series(
+        pd.Categorical.from_codes(label_codes[codes], categories=categories),
+        index=la_codes.index,
+    )
 
-        # Jahrgang (nur wenn aktiviert)
-        if s.lea_gruppe_laa_lehramt_jg == "ja":
-            vd_von = _read_str(src, "VDVon")
-            row.Jahrgang = f"LAA_{la_label}_{_extract_year_month(vd_von)}"
-        else:
-            row.Jahrgang = ""
 
-        # Seminare/Fachseminare (nur wenn aktiviert)
-        if s.lea_gruppe_laa_seminare == "ja":
-            ks_raw = (_read_str(src, "KursSeminarSchluessel")).strip()
-            fs1_raw = (_read_str(src, "KursFach1Schluessel")).strip()
-            fs2_raw = (_read_str(src, "KursFach2Schluessel")).strip()
+def _prefixed(labels: pd.Series, prefix: str) -> pd.Series:
+    """Stellt allen Kategorien prefix voran (einmal pro Kategorie statt pro Zeile)."""
+    return labels.cat.rename_categories(lambda c: prefix + c)
 
-            ks = re.sub(r"\s+", "_", ks_raw)
-            fs1 = re.sub(r"\s+", "_", fs1_raw)
-            fs2 = re.sub(r"\s+", "_", fs2_raw)
 
-            row.Kernseminar = f"Seminar_{ks}" if ks else ""
-            row.Fachseminar_1 = f"Seminar_{fs1}" if fs1 else ""
-            row.Fachseminar_2 = f"Seminar_{fs2}" if fs2 else ""
-        else:
-            row.Kernseminar = ""
-            row.Fachseminar_1 = ""
-            row.Fachseminar_2 = ""
-
-        return row
-
-    def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
-
-
-@dataclass
-class FailRow:
-    LEAID: Any = ""
-    IdentNr: str = ""
-    Nachname: str = ""
-    Vorname: str = ""
-    Typ: str = "LAA"
-    Lehramt: str = ""  # immer nützlich in der Fehlerliste
-
-    @staticmethod
-    def from_source(src: pd.Series) -> "FailRow":
-        fr = FailRow()
-        # LEAID
-        leaid_raw = _read_str(src, "LAA_Logineo")
-        fr.LEAID = _normalize_numeric_text(leaid_raw)
-
-        # IdentNr
-        ident = _read_str(src, "LAA_IdentNr")
-        if ident and len(ident) > 9:
-            fr.IdentNr = ("0" + ident) if len(ident) == 10 else ident
-        else:
-            fr.IdentNr = "IdentNr fehlt"
+def _seminar_groups(keys: pd.Series) -> pd.Series:
+    cleaned = keys.str.strip().str.replace(_ws_re, "_", regex=True)
+    return ("Seminar_" + cleaned).where(cleaned != "", "")
+
 
-        fr.Nachname = _read_str(src, "LAA_Name")
-        fr.Vorname = _read_str(src, "LAA_Vorname")
+# CSV-Exporte kommen als UTF-8 (mit/ohne BOM) oder aus Excel als Windows-1252
+_CSV_ENCODINGS = ("utf-8-sig", "cp1252")
 
-        # Lehramt
-        la_code = _read_str(src, "Lehramt")
-        lag_code = _read_str(src, "Lehramtgruppe")
-        la_label = "???"
-        if la_code:
-            key = _to_int_like(la_code)
-            la_label = LEHRAEMTER.get(key, "???") if key is not None else "???"
-        elif lag_code:
-            key = _to_int_like(lag_code)
-            la_label = LEHRAMTGRUPPEN.get(key, "???") if key is not None else "???"
-        fr.Lehramt = f"LAA_{la_label}" if la_label else "LAA_???"
-        return fr
 
-    def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+def _sniff_delimiter(path: str, encoding: str) -> str:
+    with open(path, "rb") as f:
+        # errors="replace": ein am Blockende abgeschnittenes Zeichen stört das Sniffen nicht
+        sample = f.read(64 * 1024).decode(encoding, errors="replace")
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t").delimiter
+    except csv.Error:
+        return ","
+
+
+def _read_source(path: str) -> pd.DataFrame:
+    """
+    Liest den LEA-Export als reine Textwerte, beschränkt auf _SOURCE_COLUMNS.
+    CSV-Dateien gehen direkt über read_csv (UTF-8, sonst Windows-1252); bei Excel wird python-calamine
+    genutzt, falls installiert (deutlich schneller), sonst der pandas-Standard.
+    """
+    usecols = _SOURCE_COLUMNS.__contains__  # fehlende Spalten sind kein Fehler
+    if path.lower().endswith(".csv"):
+        for encoding in _CSV_ENCODINGS:
+            try:
+                return pd.read_csv(path, dtype=str, keep_default_na=False, usecols=usecols,
+                                   sep=_sniff_delimiter(path, encoding), encoding=encoding)
+            except UnicodeDecodeError:
+                if encoding == _CSV_ENCODINGS[-1]:
+                    raise
+    try:
+        return pd.read_excel(path, dtype=str, na_filter=False, usecols=usecols, engine="calamine")
+    except ImportError:
+        return pd.read_excel(path, dtype=str, na_filter=False, usecols=usecols)
+
+
+def _preview(df: pd.DataFrame, log: Callable[[str], None]) -> None:
+    """Zeigt nur die ersten Zeilen an, statt die ganze Tabelle zu formatieren."""
+    log(df.head(_PREVIEW_ROWS).to_string(index=False))
+    if len(df) > _PREVIEW_ROWS:
+        log(f"... {len(df)} Zeilen insgesamt")
+
+
+def _write_xlsx(df: pd.DataFrame, path: str, sheet_name: str) -> None:
+    """
+    Schreibt df als .xlsx. Mit XlsxWriter (constant_memory) wird jede Zeile direkt
+    auf die Platte geschrieben; ohne XlsxWriter greift pandas (openpyxl).
+    """
+    if xlsxwriter is None:
+        df.to_excel(path, sheet_name=sheet_name, index=False)
+        return
+    wb = xlsxwriter.Workbook(path, {
+        "constant_memory": True,
+        "strings_to_formulas": False,
+        "strings_to_urls": False,
+    })
+    try:
+        ws = wb.add_worksheet(sheet_name)
+        ws.write_row(0, 0, list(df.columns), wb.add_format({"bold": True}))
+        for r, row in enumerate(df.itertuples(index=False, name=None), start=1):
+            ws.write_row(r, 0, row)
+    finally:
+        wb.close()
+
+
+def _build_table(df_src: pd.DataFrame, *, lehramt: bool, jahrgang: bool, seminare: bool) -> pd.DataFrame:
+    """
+    Baut spaltenweise die Ausgabe- und Fehlerspalten aus dem LEA-Export; die
+    optionalen Gruppenspalten nur, wenn sie in der config aktiviert sind.
+    Alle Spalten (auch LEAID/IdentNr) sind reine Textwerte, damit Excel
+    IDs nicht als Zahlen interpretiert.
+    """
+    ident = _column(df_src, "LAA_IdentNr")
+    la_label = _lehramt_labels(_column(df_src, "Lehramt"), _column(df_src, "Lehramtgruppe"))
+
+    table = pd.DataFrame({
+        "LEAID": _normalize_numeric_text(_column(df_src, "LAA_Logineo")),
+        # 10-stellige IdentNr werden auf 11 Stellen mit führender 0 aufgefüllt
+        "IdentNr": ident.str.zfill(11).where(ident.str.len() > 9, "IdentNr fehlt"),
+        "Nachname": _column(df_src, "LAA_Name"),
+        "Vorname": _column(df_src, "LAA_Vorname"),
+        "Typ": "LAA",
+        "Lehramt": _prefixed(la_label, "LAA_"),  # auch für die Fehlerliste
+    }, index=df_src.index)
+    if lehramt:
+        table["Seminar"] = _prefixed(la_label, "Seminar_")
+    if jahrgang:
+        table["Jahrgang"] = "LAA_" + la_label.astype(str) + "_" + _extract_year_month(_column(df_src, "VDVon"))
+    if seminare:
+        table["Kernseminar"] = _seminar_groups(_column(df_src, "KursSeminarSchluessel"))
+        table["Fachseminar_1"] = _seminar_groups(_column(df_src, "KursFach1Schluessel"))
+        table["Fachseminar_2"] = _seminar_groups(_column(df_src, "KursFach2Schluessel"))
+    return table
 
 
 class LEAConverter:
     """
-    Liest LEA-Excel (.xlsx), baut LOGINEO-Importtabelle und schreibt (abhängig von
+    Liest LEA-Excel (.xlsx) bzw. LEA-CSV, baut LOGINEO-Importtabelle und schreibt (abhängig von
     der Einstellung) eine Ausgabe-Datei (.csv oder .xlsx) sowie optional eine
     Fehlerliste als Excel-Datei.
     """
 
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        log: Callable[[str], None] = print,
+        *,
+        interactive: bool = True,
+    ) -> None:
         self.s = settings
+        # Ausgaben laufen über log (Konsole: print, GUI: Protokoll-Fenster)
+        self._log = log
+        # Ohne Konsole (GUI) wird nie auf Tastendruck gewartet
+        self._interactive = interactive
         self.now = datetime.now()
         self.dt_string = self.now.strftime("%Y-%m-%d_%H-%M-%S")
         # Ausgabeordner aus den Einstellungen (Default: "output")
         self.output_dir = resolve_path(self.s.lea_outputpath or "output")
         ensure_dir(self.output_dir)
+        # Gruppen-Optionen einmalig auswerten
+        self._with_lehramt = self.s.lea_gruppe_laa_lehramt == "ja"
+        self._with_jahrgang = self.s.lea_gruppe_laa_lehramt_jg == "ja"
+        self._with_seminare = self.s.lea_gruppe_laa_seminare == "ja"
+
+    def _pause(self, msg: str | None = None) -> None:
+        if self._interactive:
+            pause(msg)
 
     def _ok_columns(self) -> List[str]:
         """
         Spalten, die wirklich ausgegeben werden sollen – dynamisch gemäß config.
         """
         cols = ["LEAID", "IdentNr", "Nachname", "Vorname", "Typ"]
-        if self.s.lea_gruppe_laa_lehramt == "ja":
+        if self._with_lehramt:
             cols += ["Seminar", "Lehramt"]
-        if self.s.lea_gruppe_laa_lehramt_jg == "ja":
+        if self._with_jahrgang:
             cols += ["Jahrgang"]
-        if self.s.lea_gruppe_laa_seminare == "ja":
+        if self._with_seminare:
             cols += ["Kernseminar", "Fachseminar_1", "Fachseminar_2"]
         return cols
 
@@ -214,83 +269,70 @@ class LEAConverter:
         return fmt if fmt in {"csv", "xlsx"} else "csv"
 
     def convert(self) -> None:
-        print("\nIhre LEA-Excel-Datei wird nun eingelesen.\n")
+        self._log("\nIhre LEA-Excel-Datei wird nun eingelesen.\n")
 
         lea_path = resolve_path(self.s.lea_xlsx_file)
         if not os.path.isfile(lea_path):
-            print("FEHLER!")
-            print(f"Die LEA-Datei ({lea_path}) wurde nicht gefunden.")
-            pause("\nDrücken Sie eine beliebige Taste, um zu bestätigen und den Prozess zu beenden.")
+            self._log("FEHLER!")
+            self._log(f"Die LEA-Datei ({lea_path}) wurde nicht gefunden.")
+            self._pause("\nDrücken Sie eine beliebige Taste, um zu bestätigen und den Prozess zu beenden.")
             raise FileNotFoundError(lea_path)
 
-        if not lea_path.lower().endswith((".xls", ".xlsx")):
-            print("FEHLER! Die Datei hat kein zulässiges Dateiformat. zulässig sind: .xls / .xlsx")
-            pause()
+        if not lea_path.lower().endswith((".xls", ".xlsx", ".csv")):
+            self._log("FEHLER! Die Datei hat kein zulässiges Dateiformat. zulässig sind: .xls / .xlsx / .csv")
+            self._pause()
             raise ValueError("Ungültiges Dateiformat")
 
-        df_src = pd.read_excel(lea_path, dtype=str)
-        df_src.fillna("", inplace=True)
-
-        rows_ok: List[Dict[str, Any]] = []
-        rows_err: List[Dict[str, Any]] = []
+        df_src = _read_source(lea_path)
+        missing = sorted(_SOURCE_COLUMNS.difference(df_src.columns))
+        if missing:
+            self._log("Hinweis: Folgende Spalten fehlen im LEA-Export und bleiben leer: " + ", ".join(missing))
 
         primary = self.s.lea_primary_key  # "LEAID" oder "IdentNr"
 
-        for _, src in df_src.iterrows():
-            try:
-                if primary == "IdentNr":
-                    ident = _read_str(src, "LAA_IdentNr")
-                    if ident and len(ident) > 9:
-                        rows_ok.append(OutputRow.from_source(src, self.s).to_dict())
-                    else:
-                        rows_err.append(FailRow.from_source(src).to_dict())
-
-                elif primary == "LEAID":
-                    leaid_raw = _read_str(src, "LAA_Logineo")
-                    if leaid_raw != "":
-                        rows_ok.append(OutputRow.from_source(src, self.s).to_dict())
-                    else:
-                        rows_err.append(FailRow.from_source(src).to_dict())
-                else:
-                    raise ValueError("lea_primary_key muss 'LEAID' oder 'IdentNr' sein.")
-
-            except Exception as e:
-                print("\nFEHLER - FEHLER - FEHLER (#convert).")
-                print("Bei der Ausführung ist etwas schiefgelaufen.")
-                print("Überprüfen Sie die Einstellungen (config.xml) und die Quell-Datei.")
-                print(f"Details: {e}")
-                pause("\nDrücken Sie eine beliebige Taste, um das Programm zu beenden.")
-                raise
+        try:
+            if primary == "IdentNr":
+                ok_mask = _column(df_src, "LAA_IdentNr").str.len() > 9
+            elif primary == "LEAID":
+                ok_mask = _column(df_src, "LAA_Logineo") != ""
+            else:
+                raise ValueError("lea_primary_key muss 'LEAID' oder 'IdentNr' sein.")
+            df_all = _build_table(
+                df_src,
+                lehramt=self._with_lehramt,
+                jahrgang=self._with_jahrgang,
+                seminare=self._with_seminare,
+            )
+
+        except Exception as e:
+            self._log("\nFEHLER - FEHLER - FEHLER (#convert).")
+            self._log("Bei der Ausführung ist etwas schiefgelaufen.")
+            self._log("Überprüfen Sie die Einstellungen (config.xml) und die Quell-Datei.")
+            self._log(f"Details: {e}")
+            self._pause("\nDrücken Sie eine beliebige Taste, um das Programm zu beenden.")
+            raise
 
         # >>> HIER: Spalten dynamisch wählen – nur aktivierte Spalten erscheinen im Output
         ok_cols = self._ok_columns()
 
         # DataFrames bauen
-        df_ok = pd.DataFrame(rows_ok, columns=ok_cols)
-        df_err = pd.DataFrame(rows_err, columns=["LEAID", "IdentNr", "Nachname", "Vorname", "Typ", "Lehramt"])
-
-        # Sicherstellen, dass ID-Spalten wirklich als Text exportiert werden
-        for target in (df_ok, df_err):
-            for col in ("LEAID", "IdentNr"):
-                if col in target.columns:
-                    target[col] = target[col].apply(
-                        lambda v: "" if (v is None or pd.isna(v)) else str(v)
-                    )
+        df_ok = df_all.loc[ok_mask, ok_cols].reset_index(drop=True)
+        df_err = df_all.loc[~ok_mask, _FAIL_COLUMNS].reset_index(drop=True)
 
         if not df_err.empty:
-            print("\nEinige importierte Zeilen weisen Probleme auf (siehe unten):")
-            print(df_err)
+            self._log("\nEinige importierte Zeilen weisen Probleme auf (siehe unten):")
+            _preview(df_err, self._log)
             err_name = f"{self.dt_string}_Referendare_FEHLER.xlsx"
-            df_err.to_excel(os.path.join(self.output_dir, err_name), sheet_name="Referendare-FEHLER", index=False)
-            print(f"\nEs wurde eine Excel-Datei mit der Fehlerliste im Ordner '{self.output_dir}' erstellt.")
-            pause("\nWenn Sie die Fehler ignorieren möchten, Drücken Sie eine beliebige Taste, um fortzufahren. "
+            _write_xlsx(df_err, os.path.join(self.output_dir, err_name), "Referendare-FEHLER")
+            self._log(f"\nEs wurde eine Excel-Datei mit der Fehlerliste im Ordner '{self.output_dir}' erstellt.")
+            self._pause("\nWenn Sie die Fehler ignorieren möchten, Drücken Sie eine beliebige Taste, um fortzufahren. "
                   "Wenn nicht, Drücken Sie Strg+C, um abzubrechen.")
 
         if not df_ok.empty:
-            print("\nHier eine Übersicht der finalen Tabellen-Struktur und der anzulegenden Nutzer:\n")
-            print(df_ok)
+            self._log("\nHier eine Übersicht der finalen Tabellen-Struktur und der anzulegenden Nutzer:\n")
+            _preview(df_ok, self._log)
 
-            pause("\nÜberprüfen Sie die Daten. Wenn alles gut aussieht, Drücken Sie eine beliebige Taste, um fortzufahren.")
+            self._pause("\nÜberprüfen Sie die Daten. Wenn alles gut aussieht, Drücken Sie eine beliebige Taste, um fortzufahren.")
             out_name_xlsx = f"{self.dt_string}_referendare.xlsx"
             out_name_csv = f"{self.dt_string}_referendare.csv"
             out_path_xlsx = os.path.join(self.output_dir, out_name_xlsx)
@@ -299,22 +341,25 @@ class LEAConverter:
             output_format = self._output_format()
             created_desc: List[str] = []
             if output_format == "xlsx":
-                df_ok.to_excel(out_path_xlsx, sheet_name="Referendare", index=False)
+                if len(df_ok) > _XLSX_WARN_ROWS:
+                    self._log(f"\nHinweis: Die XLSX-Ausgabe ist bei {len(df_ok)} Zeilen deutlich langsamer als CSV "
+                          "(Einstellung lea_output_format = csv).")
+                _write_xlsx(df_ok, out_path_xlsx, "Referendare")
                 created_desc.append(f"- {out_name_xlsx}")
             else:
                 df_ok.to_csv(out_path_csv, index=False, encoding="utf-8-sig", lineterminator="\n")
                 created_desc.append(f"- {out_name_csv} (UTF-8-BOM, Zeilenende LF)")
 
-            print(f"\nDie Datei wurde im Ordner '{self.output_dir}' angelegt:")
+            self._log(f"\nDie Datei wurde im Ordner '{self.output_dir}' angelegt:")
             for desc in created_desc:
-                print(desc)
-            print("Sie können diese Dateien nun in der Nutzerverwaltung LOGINEO NRW importieren.")
-            print(f"Ergebnisse wurden im Output-Ordner abgelegt: '{self.output_dir}'.")
-            pause("\nDrücken Sie eine beliebige Taste, um das Programm zu beenden.")
+                self._log(desc)
+            self._log("Sie können diese Dateien nun in der Nutzerverwaltung LOGINEO NRW importieren.")
+            self._log(f"Ergebnisse wurden im Output-Ordner abgelegt: '{self.output_dir}'.")
+            self._pause("\nDrücken Sie eine beliebige Taste, um das Programm zu beenden.")
             return
         else:
-            print("\nIhre Tabelle enthält keine gültigen Werte. Der Prozess wird abgebrochen.")
-            pause()
+            self._log("\nIhre Tabelle enthält keine gültigen Werte. Der Prozess wird abgebrochen.")
+            self._pause()
             return
 
 
@@ -3,9 +3,17 @@
 
 from __future__ import annotations
 
+import csv
+import functools
+import hashlib
+import multiprocessing
 import os
+import subprocess
 import sys
 import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, replace
+from types import MappingProxyType
 import traceback
 import queue
 import tkinter as tk
@@ -13,26 +21,201 @@ from tkinter import ttk, filedialog, messagebox
 import tkinter.font as tkfont
 from tkinter.scrolledtext import ScrolledText
 
+try:
+    from python_calamine import CalamineWorkbook  # optional: Rust-based .xls/.xlsx reader
+except ImportError:  # Fallback: openpyxl/xlrd
+    CalamineWorkbook = None
+
 from .io_utils import appdir, resolve_path, ensure_dir
-import pandas as pd
 from .settings import load_settings, Settings, save_settings
-from .converter import LEAConverter
-from .pdf_generator import PDFGenerator
+# converter/pdf_generator (pandas, reportlab) are imported lazily inside the worker process
+
+
+# Static texts of the Start and Info tabs
+_START_HELP = (
+    "Willkommen im LEA-LOGINEO-Tool für ZfsL!\n\n"
+    "Dieses Programm hat zwei Bereiche:\n"
+    "1) LEA → LOGINEO: Das Programm wandelt eine im Verwaltungsprogramm LEA per Seriendruck-Funktion erzeugte Excel-Datei in eine in LOGINEO NRW importierbare Datei um.\n"
+    "   Es werden automatisch Gruppen generiert (LAA, LAA_Lehramt, Lehramt_Seminar), die in LOGINEO verwendet weden können.\n\n"
+    "2) LOGINEO PDF-Generator: Das Programm erzeugt aus einer LOGINEO-Ausgabedatei (Excel oder CSV) personenbezogene PDF Dateien mit den Zugangsdaten.\n"
+    "   Es besteht die Möglichkeit, alle Zugangsdaten in einer PDF-Datei auszugeben oder für jede Person einzeln.\n\n"
+    "So gehen Sie vor:\n"
+    "- Prüfen Sie im jeweiligen Tab zuerst die Einstellungen.\n"
+    "- Wählen Sie die passende Quelldatei aus (LEA-Excel oder LOGINEO-CSV/XLS).\n"
+    "- Starten Sie die Aktion und öffnen Sie danach den jeweiligen Ausgabe-Ordner.\n\n"
+    "Tipps:\n"
+    "- Bei LEA ist ‘LEAID’ in der Regel die beste Wahl als Kennung.\n"
+    "- Achten Sie bei CSV auf das richtige Trennzeichen (meist ,).\n"
+    "- Ihre Ausgabe-Ordner können Sie in den Einstellungen anpassen.\n"
+)
+
+_INFO_HELP = (
+    "Inoffizielles LEA-LOGINEO NRW Tool\n\n"
+    "Erstellt durch:\n"
+    "Johannes Schirge\n"
+    "ZfsL Bielefeld\n"
+    "johannes.schirge@zfsl-bielefeld.nrw.schule\n\n"
+    "Hinweis:\n"
+    "Dieses Programm wird OHNE JEGLICHE GARANTIE bereitgestellt. Eine Nutzung erfolgt auf eigene Verantwortung.\n"
+    "Dies ist freie Software; Sie dürfen sie unter bestimmten Bedingungen weiterverbreiten.\n"
+    "Einzelheiten finden Sie in der Datei LICENSE (GNU GPLv3).\n\n"
+    "Rechtlicher Hinweis:\n"
+    "Alle genannten Produktnamen, Logos und Marken sind Eigentum der jeweiligen Rechteinhaber.\n"
+    "Die Verwendung dient ausschließlich der Identifikation und impliziert keine Verbindung, Unterstützung oder Billigung durch die Rechteinhaber."
+)
+
+# Upper bound for lines kept in the log widget; older lines are dropped
+_LOG_MAX_LINES = 5000
+
+# Number of cached XLS->CSV conversions kept in tmp/
+_TMP_CACHE_KEEP = 10
+
+
+def _prune_tmp_cache(tmp_dir: str, keep: int = _TMP_CACHE_KEEP) -> None:
+    """Removes all but the `keep` most recently used CSV files from tmp/."""
+    try:
+        entries = [e for e in os.scandir(tmp_dir) if e.is_file() and e.name.endswith(".csv")]
+    except OSError:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    for e in entries[keep:]:
+        try:
+            os.remove(e.path)
+        except OSError:
+            pass
+
+
+# Marker sent by the worker after its last log line of a job
+_JOB_DONE = "\x00job-done"
+# Queue item tag for a finished job future: (_FUTURE_DONE, future)
+_FUTURE_DONE = "future-done"
+# Log polling interval while a job runs (ms)
+_LOG_POLL_MS = 80
+
+# Log queue of the worker process (set by _init_worker)
+_worker_log_q = None
+
+
+def _init_worker(log_q) -> None:
+    """Initializer of the job process: remember the log queue."""
+    global _worker_log_q
+    _worker_log_q = log_q
 
 
-class _TextStream:
-    """A lightweight stream wrapper that pushes text to a queue for GUI consumption."""
+def _worker_log(text: str) -> None:
+    # print()-compatible log callback for the worker classes
+    _worker_log_q.put(text if text.endswith("\n") else text + "\n")
 
-    def __init__(self, q: "queue.Queue[str]") -> None:
-        self._q = q
 
-    def write(self, s: str) -> int:
-        if s:
-            self._q.put(s)
-        return len(s)
+def _prewarm_imports() -> None:
+    """Imports the heavy worker modules up front so the first job starts fast."""
+    try:
+        from . import converter, pdf_generator  # noqa: F401
+    except Exception:
+        # Errors surface again (with details) when the job actually runs
+        pass
+
 
-    def flush(self) -> None:  # pragma: no cover - noop
+def _run_job(task: str, settings: dict) -> None:
+    """Runs one converter/PDF job in the worker process (top-level, hence picklable)."""
+    try:
+        s = Settings(**settings)
+        if task == "convert":
+            from .converter import LEAConverter
+            LEAConverter(s, log=_worker_log, interactive=False).convert()
+        elif task == "pdf_csv":
+            from .pdf_generator import PDFGenerator
+            PDFGenerator(s, log=_worker_log, interactive=False).generate()
+        elif task == "pdf_xml":
+            from .pdf_generator import PDFGenerator
+            PDFGenerator(s, log=_worker_log, interactive=False).generate_from_xml()
+        else:
+            raise ValueError(f"Unbekannte Aufgabe: {task!r}")
+    except SystemExit:
+        # The workers use SystemExit for "nothing to do"; the message is already logged
         pass
+    except Exception:
+        _worker_log(traceback.format_exc())
+    finally:
+        # Goes through the same queue, so it arrives after all log lines of this job
+        _worker_log_q.put(_JOB_DONE)
+
+
+@functools.lru_cache(maxsize=None)
+def _swatch(color: str) -> tk.PhotoImage:
+    """Small color swatch for the tabs; built once per color and process."""
+    img = tk.PhotoImage(width=10, height=10)
+    img.put(color, to=(0, 0, 10, 10))
+    return img
+
+
+def _reveal(path: str) -> None:
+    """Opens a folder in the platform file manager without blocking the UI thread."""
+    if sys.platform.startswith("win"):
+        os.startfile(path)  # type: ignore[attr-defined]
+        return
+    opener = "open" if sys.platform == "darwin" else "xdg-open"
+    subprocess.Popen(
+        [opener, path],
+        start_new_session=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+# File signatures of real workbooks: .xlsx (ZIP) and .xls (OLE2)
+_WORKBOOK_MAGIC = (b"PK\x03\x04", b"\xd0\xcf\x11\xe0")
+
+
+def _is_workbook(path: str) -> bool:
+    """True if the file really is an Excel workbook and not, e.g., a CSV renamed to .xls."""
+    with open(path, "rb") as f:
+        return f.read(4).startswith(_WORKBOOK_MAGIC)
+
+
+def _cell_text(value) -> str:
+    """Formats a workbook cell like pandas' dtype=str did (None -> "", 12.0 -> "12")."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _iter_sheet_rows(xls_path: str):
+    """Yields the rows of the first sheet as lists of strings, streaming from the workbook."""
+    if CalamineWorkbook is not None:
+        sheet = CalamineWorkbook.from_path(xls_path).get_sheet_by_index(0)
+        # Keep leading empty rows/columns like the xlrd/openpyxl paths below
+        for row in sheet.to_python(skip_empty_area=False):
+            yield [_cell_text(v) for v in row]
+        return
+    if os.path.splitext(xls_path)[1].lower() == ".xls":
+        import xlrd
+        book = xlrd.open_workbook(xls_path, on_demand=True)
+        try:
+            sheet = book.sheet_by_index(0)
+            for row in sheet.get_rows():
+                cells = []
+                for c in row:
+                    if c.ctype == xlrd.XL_CELL_DATE:
+                        cells.append(str(xlrd.xldate.xldate_as_datetime(c.value, book.datemode)))
+                    elif c.ctype == xlrd.XL_CELL_BOOLEAN:
+                        cells.append(str(bool(c.value)))
+                    else:
+                        cells.append(_cell_text(c.value))
+                yield cells
+        finally:
+            book.release_resources()
+    else:
+        from openpyxl import load_workbook
+        wb = load_workbook(xls_path, read_only=True, data_only=True)
+        try:
+            ws = wb.worksheets[0]
+            for row in ws.iter_rows(values_only=True):
+                yield [_cell_text(v) for v in row]
+        finally:
+            wb.close()
 
 
 class App(tk.Tk):
@@ -40,6 +223,7 @@ class App(tk.Tk):
         super().__init__()
         self.title("LEA-LOGINEO-Tool – GUI")
         self._configure_fonts()
+        self._configure_styles()
 
         # Load settings from config.xml
         try:
@@ -78,11 +262,17 @@ class App(tk.Tk):
 
         # UI State
         self._running = False
-        self._log_q: "queue.Queue[str]" = queue.Queue()
+        self._pool: ProcessPoolExecutor | None = None
+        self._settings_dialog: SettingsDialog | None = None
+        self._job_log_q = None
+        # Only queue puts from non-Tk threads; the Tk thread drains it (see _poll_log_queue)
+        self._log_q: "queue.Queue" = queue.Queue()
 
         self._build_ui()
         self._set_initial_geometry()
-        self.after(50, self._drain_log_queue)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        # Start the job process in the background so the first click finds it warm
+        self.after_idle(lambda: self._ensure_pool().submit(_prewarm_imports))
 
     # ---------------- UI ----------------
     def _build_ui(self) -> None:
@@ -98,99 +288,77 @@ class App(tk.Tk):
         notebook.pack(fill=tk.BOTH, expand=True, padx=padx, pady=pady)
 
         # Small color swatches for tabs (for subtle color hints)
-        def _mk_swatch(color: str) -> tk.PhotoImage:
-            img = tk.PhotoImage(width=10, height=10)
-            img.put(color, to=(0, 0, 10, 10))
-            return img
-        self._img_start = _mk_swatch("#e8e8e8")
-        self._img_lea = _mk_swatch("#6aa9ff")
-        self._img_log = _mk_swatch("#5cc98a")
-        self._img_info = _mk_swatch("#d7d7d7")
-
-        # Subtle color accents for better separation
-        lea_bg = "#eef6ff"   # light blue tint
-        log_bg = "#eefaf2"   # light green tint
+        self._img_start = _swatch("#e8e8e8")
+        self._img_lea = _swatch("#6aa9ff")
+        self._img_log = _swatch("#5cc98a")
+        self._img_info = _swatch("#d7d7d7")
 
         # LEA Tab
         # Start Tab (first)
         start_tab = ttk.Frame(notebook)
         notebook.add(start_tab, text="Start", image=self._img_start, compound="left")
 
-        start_text = ScrolledText(start_tab, wrap=tk.WORD, height=14)
+        # Read-only help texts: no undo stack needed
+        start_text = ScrolledText(start_tab, wrap=tk.WORD, height=14, undo=False, autoseparators=False)
         start_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        start_text.insert(tk.END, (
-            "Willkommen im LEA-LOGINEO-Tool für ZfsL!\n\n"
-            "Dieses Programm hat zwei Bereiche:\n"
-            "1) LEA → LOGINEO: Das Programm wandelt eine im Verwaltungsprogramm LEA per Seriendruck-Funktion erzeugte Excel-Datei in eine in LOGINEO NRW importierbare Datei um.\n"
-            "   Es werden automatisch Gruppen generiert (LAA, LAA_Lehramt, Lehramt_Seminar), die in LOGINEO verwendet weden können.\n\n"
-            "2) LOGINEO PDF-Generator: Das Programm erzeugt aus einer LOGINEO-Ausgabedatei (Excel oder CSV) personenbezogene PDF Dateien mit den Zugangsdaten.\n"
-            "   Es besteht die Möglichkeit, alle Zugangsdaten in einer PDF-Datei auszugeben oder für jede Person einzeln.\n\n"
-            "So gehen Sie vor:\n"
-            "- Prüfen Sie im jeweiligen Tab zuerst die Einstellungen.\n"
-            "- Wählen Sie die passende Quelldatei aus (LEA-Excel oder LOGINEO-CSV/XLS).\n"
-            "- Starten Sie die Aktion und öffnen Sie danach den jeweiligen Ausgabe-Ordner.\n\n"
-            "Tipps:\n"
-            "- Bei LEA ist ‘LEAID’ in der Regel die beste Wahl als Kennung.\n"
-            "- Achten Sie bei CSV auf das richtige Trennzeichen (meist ,).\n"
-            "- Ihre Ausgabe-Ordner können Sie in den Einstellungen anpassen.\n"
-        ))
+        start_text.insert(tk.END, _START_HELP)
         start_text.configure(state=tk.DISABLED)
 
-        lea_tab = tk.Frame(notebook, bg=lea_bg)
+        lea_tab = ttk.Frame(notebook, style="LEA.TFrame")
         notebook.add(lea_tab, text="LEA → LOGINEO", image=self._img_lea, compound="left")
-        lea_head = tk.Frame(lea_tab, bg=lea_bg)
+        lea_head = ttk.Frame(lea_tab, style="LEA.TFrame")
         lea_head.pack(fill=tk.X, padx=6, pady=(6, 6))
-        lbl_lea_desc = tk.Label(
+        lbl_lea_desc = ttk.Label(
             lea_head,
             text="Konvertiert eine LEA-Excel-Datei in eine LOGINEO-Importtabelle (XLSX) mit optionalen Gruppen.",
-            bg=lea_bg,
-            fg="#444",
+            style="LEA.TLabel",
+            foreground="#444",
             wraplength=820,
             anchor="w",
             justify=tk.LEFT,
         )
         lbl_lea_desc.pack(anchor=tk.W, padx=2, pady=(0, 4))
-        lea_head_row = tk.Frame(lea_head, bg=lea_bg)
+        lea_head_row = ttk.Frame(lea_head, style="LEA.TFrame")
         lea_head_row.pack(fill=tk.X)
         ttk.Button(lea_head_row, text="Einstellungen (LEA)", command=self._open_settings_lea).pack(side=tk.LEFT)
-        tk.Label(lea_head_row, text="Hinweis: Bitte vor dem Ausführen die LEA-Einstellungen prüfen und ggf. anpassen.", bg=lea_bg, fg="#555").pack(side=tk.LEFT, padx=(8, 0))
+        ttk.Label(lea_head_row, text="Hinweis: Bitte vor dem Ausführen die LEA-Einstellungen prüfen und ggf. anpassen.", style="LEA.TLabel", foreground="#555").pack(side=tk.LEFT, padx=(8, 0))
 
-        lea_frame = tk.Frame(lea_tab, bg=lea_bg)
+        lea_frame = ttk.Frame(lea_tab, style="LEA.TFrame")
         lea_frame.pack(fill=tk.X, padx=6, pady=6)
-        tk.Label(lea_frame, text="LEA-Excel (.xlsx):", bg=lea_bg).grid(row=0, column=0, sticky=tk.W)
+        ttk.Label(lea_frame, text="LEA-Excel (.xlsx):", style="LEA.TLabel").grid(row=0, column=0, sticky=tk.W)
         self.var_lea = tk.StringVar(value=self._resolved(self.settings.lea_xlsx_file))
         ttk.Entry(lea_frame, textvariable=self.var_lea, width=80).grid(row=0, column=1, sticky=tk.W)
         ttk.Button(lea_frame, text="Durchsuchen…", command=self._pick_lea).grid(row=0, column=2, padx=6)
         self.btn_run_lea = ttk.Button(lea_frame, text="Konvertiere LEA → LOGINEO", command=self._run_convert)
         self.btn_run_lea.grid(row=0, column=3, padx=6)
 
-        lea_actions = tk.Frame(lea_tab, bg=lea_bg)
+        lea_actions = ttk.Frame(lea_tab, style="LEA.TFrame")
         lea_actions.pack(fill=tk.X, padx=6, pady=(0, 6))
         ttk.Button(lea_actions, text="LEA-Output öffnen", command=self._open_output).pack(side=tk.LEFT)
 
         # LOGINEO Tab
-        log_tab = tk.Frame(notebook, bg=log_bg)
+        log_tab = ttk.Frame(notebook, style="LOG.TFrame")
         notebook.add(log_tab, text="LOGINEO PDF-Generator", image=self._img_log, compound="left")
-        log_head = tk.Frame(log_tab, bg=log_bg)
+        log_head = ttk.Frame(log_tab, style="LOG.TFrame")
         log_head.pack(fill=tk.X, padx=6, pady=(6, 6))
-        lbl_log_desc = tk.Label(
+        lbl_log_desc = ttk.Label(
             log_head,
             text="Erzeugt personalisierte Zugangsdaten-PDFs aus LOGINEO CSV/XLS. Ausgabe nach Lehramt/Seminar konfigurierbar.",
-            bg=log_bg,
-            fg="#444",
+            style="LOG.TLabel",
+            foreground="#444",
             wraplength=820,
             anchor="w",
             justify=tk.LEFT,
         )
         lbl_log_desc.pack(anchor=tk.W, padx=2, pady=(0, 4))
-        log_head_row = tk.Frame(log_head, bg=log_bg)
+        log_head_row = ttk.Frame(log_head, style="LOG.TFrame")
         log_head_row.pack(fill=tk.X)
         ttk.Button(log_head_row, text="Einstellungen (LOGINEO)", command=self._open_settings_logineo).pack(side=tk.LEFT)
-        tk.Label(log_head_row, text="Hinweis: Bitte vor dem Ausführen die LOGINEO-Einstellungen prüfen und ggf. anpassen.", bg=log_bg, fg="#555").pack(side=tk.LEFT, padx=(8, 0))
+        ttk.Label(log_head_row, text="Hinweis: Bitte vor dem Ausführen die LOGINEO-Einstellungen prüfen und ggf. anpassen.", style="LOG.TLabel", foreground="#555").pack(side=tk.LEFT, padx=(8, 0))
 
-        pdf_frame = tk.Frame(log_tab, bg=log_bg)
+        pdf_frame = ttk.Frame(log_tab, style="LOG.TFrame")
         pdf_frame.pack(fill=tk.X, padx=6, pady=6)
-        tk.Label(pdf_frame, text="LOGINEO CSV oder XLS (.csv/.xls):", bg=log_bg).grid(row=0, column=0, sticky=tk.W)
+        ttk.Label(pdf_frame, text="LOGINEO CSV oder XLS (.csv/.xls):", style="LOG.TLabel").grid(row=0, column=0, sticky=tk.W)
         initial_logineo = getattr(self.settings, "logineo_xml_file", "") or self.settings.logineo_csv_file
         self.var_logineo = tk.StringVar(value=self._resolved(initial_logineo))
         ttk.Entry(pdf_frame, textvariable=self.var_logineo, width=80).grid(row=0, column=1, sticky=tk.W)
@@ -198,30 +366,16 @@ class App(tk.Tk):
         self.btn_run_pdf = ttk.Button(pdf_frame, text="PDFs erzeugen", command=self._run_pdf)
         self.btn_run_pdf.grid(row=0, column=3, padx=6)
 
-        pdf_actions = tk.Frame(log_tab, bg=log_bg)
+        pdf_actions = ttk.Frame(log_tab, style="LOG.TFrame")
         pdf_actions.pack(fill=tk.X, padx=6, pady=6)
         ttk.Button(pdf_actions, text="LOGINEO-Output öffnen", command=self._open_logineo_output).pack(side=tk.LEFT)
 
         # Info Tab (rechts)
         info_tab = ttk.Frame(notebook)
         notebook.add(info_tab, text="Info", image=self._img_info, compound="left")
-        info_text = ScrolledText(info_tab, wrap=tk.WORD, height=14)
+        info_text = ScrolledText(info_tab, wrap=tk.WORD, height=14, undo=False, autoseparators=False)
         info_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        info_content = (
-            "Inoffizielles LEA-LOGINEO NRW Tool\n\n"
-            "Erstellt durch:\n"
-            "Johannes Schirge\n"
-            "ZfsL Bielefeld\n"
-            "johannes.schirge@zfsl-bielefeld.nrw.schule\n\n"
-            "Hinweis:\n"
-            "Dieses Programm wird OHNE JEGLICHE GARANTIE bereitgestellt. Eine Nutzung erfolgt auf eigene Verantwortung.\n"
-            "Dies ist freie Software; Sie dürfen sie unter bestimmten Bedingungen weiterverbreiten.\n"
-            "Einzelheiten finden Sie in der Datei LICENSE (GNU GPLv3).\n\n"
-            "Rechtlicher Hinweis:\n"
-            "Alle genannten Produktnamen, Logos und Marken sind Eigentum der jeweiligen Rechteinhaber.\n"
-            "Die Verwendung dient ausschließlich der Identifikation und impliziert keine Verbindung, Unterstützung oder Billigung durch die Rechteinhaber."
-        )
-        info_text.insert(tk.END, info_content)
+        info_text.insert(tk.END, _INFO_HELP)
         info_text.configure(state=tk.DISABLED)
 
         # Select Start tab initially
@@ -234,23 +388,30 @@ class App(tk.Tk):
         self.bind_all("<Alt-G>", lambda e: self._open_settings_logineo())
         self.bind_all("<F1>", lambda e: notebook.select(start_tab))
         # Dynamically adapt description wrap to available width
-        def _adapt_wrap_lea(event=None):
-            try:
-                lbl_lea_desc.configure(wraplength=max(300, lea_tab.winfo_width() - 40))
-            except Exception:
-                pass
-        def _adapt_wrap_log(event=None):
-            try:
-                lbl_log_desc.configure(wraplength=max(300, log_tab.winfo_width() - 40))
-            except Exception:
-                pass
-        lea_tab.bind("<Configure>", _adapt_wrap_lea)
-        log_tab.bind("<Configure>", _adapt_wrap_log)
+        # (debounced: a resize drag fires <Configure> per pixel, we only act once it settles)
+        self._wrap_after_ids: dict[str, str] = {}
+
+        def _debounced_wrap(key: str, label: ttk.Label, tab: ttk.Frame):
+            def _do_adapt():
+                self._wrap_after_ids.pop(key, None)
+                try:
+                    label.configure(wraplength=max(300, tab.winfo_width() - 40))
+                except Exception:
+                    pass
+
+            def _on_configure(event=None):
+                after_id = self._wrap_after_ids.get(key)
+                if after_id:
+                    self.after_cancel(after_id)
+                self._wrap_after_ids[key] = self.after(50, _do_adapt)
+            return _on_configure
+        lea_tab.bind("<Configure>", _debounced_wrap("lea", lbl_lea_desc, lea_tab))
+        log_tab.bind("<Configure>", _debounced_wrap("log", lbl_log_desc, log_tab))
 
         # Log
         frm_log = ttk.LabelFrame(self, text="Protokoll")
         frm_log.pack(fill=tk.BOTH, expand=True, padx=padx, pady=pady)
-        self.txt = tk.Text(frm_log, wrap=tk.WORD, state=tk.DISABLED)
+        self.txt = tk.Text(frm_log, wrap=tk.WORD, state=tk.DISABLED, undo=False, autoseparators=False, maxundo=0)
         self.txt.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
         sb = ttk.Scrollbar(frm_log, orient=tk.VERTICAL, command=self.txt.yview)
         sb.pack(side=tk.RIGHT, fill=tk.Y)
@@ -275,7 +436,7 @@ class App(tk.Tk):
     def _pick_lea(self) -> None:
         fn = filedialog.askopenfilename(
             title="LEA-Excel auswählen",
-            filetypes=[("Excel", "*.xlsx;*.xls"), ("Alle Dateien", "*.*")],
+            filetypes=[("Excel", "*.xlsx;*.xls"), ("CSV", "*.csv"), ("Alle Dateien", "*.*")],
             initialdir=os.path.dirname(self.var_lea.get() or appdir),
         )
         if fn:
@@ -297,41 +458,44 @@ class App(tk.Tk):
     def _open_output(self) -> None:
         path = resolve_path(self.settings.lea_outputpath or "output")
         try:
-            if sys.platform.startswith("win"):
-                os.startfile(path)  # type: ignore[attr-defined]
-            elif sys.platform == "darwin":
-                os.system(f"open '{path}'")
-            else:
-                os.system(f"xdg-open '{path}'")
+            _reveal(path)
         except Exception as e:
             messagebox.showerror("Öffnen fehlgeschlagen", str(e))
 
+    def _show_settings(self, section: str | None = None) -> None:
+        # Build the dialog once, afterwards only refresh and re-show it
+        if self._settings_dialog is None:
+            self._settings_dialog = SettingsDialog(
+                self, self.settings, on_save=self._apply_and_save_settings, section=section
+            )
+        else:
+            self._settings_dialog.show(section, self.settings)
+
     def _open_settings(self) -> None:
-        SettingsDialog(self, self.settings, on_save=self._apply_and_save_settings)
+        self._show_settings()
 
     def _open_settings_lea(self) -> None:
-        SettingsDialog(self, self.settings, on_save=self._apply_and_save_settings, section="lea")
+        self._show_settings("lea")
 
     def _open_settings_logineo(self) -> None:
-        SettingsDialog(self, self.settings, on_save=self._apply_and_save_settings, section="logineo")
+        self._show_settings("logineo")
 
     def _open_logineo_output(self) -> None:
         path = resolve_path(self.settings.pdf_outputpath or "pdf-files")
         try:
-            if sys.platform.startswith("win"):
-                os.startfile(path)  # type: ignore[attr-defined]
-            elif sys.platform == "darwin":
-                os.system(f"open '{path}'")
-            else:
-                os.system(f"xdg-open '{path}'")
+            _reveal(path)
         except Exception as e:
             messagebox.showerror("Öffnen fehlgeschlagen", str(e))
 
     def _apply_and_save_settings(self, new_settings: Settings) -> None:
         # Update state in app
-        self.settings = new_settings
-        # Ensure directories exist for updated settings
-        self._ensure_output_dirs()
+        old_settings, self.settings = self.settings, new_settings
+        # Ensure directories exist, but only if the output paths actually changed
+        if (old_settings.lea_outputpath, old_settings.pdf_outputpath) != (
+            new_settings.lea_outputpath,
+            new_settings.pdf_outputpath,
+        ):
+            self._ensure_output_dirs()
         # Reflect into entry fields
         self.var_lea.set(self._resolved(self.settings.lea_xlsx_file))
         initial_logineo = getattr(self.settings, "logineo_xml_file", "") or self.settings.logineo_csv_file
@@ -350,6 +514,7 @@ class App(tk.Tk):
             pdf_dir = resolve_path(self.settings.pdf_outputpath or "pdf-files")
             ensure_dir(lea_dir)
             ensure_dir(pdf_dir)
+            _prune_tmp_cache(resolve_path("tmp"))
         except Exception:
             # Do not block startup on directory errors; open buttons will still error if misconfigured
             pass
@@ -371,6 +536,16 @@ class App(tk.Tk):
         except Exception:
             pass
 
+    def _configure_styles(self) -> None:
+        # Subtle color accents for better separation, shared via ttk styles
+        lea_bg = "#eef6ff"   # light blue tint
+        log_bg = "#eefaf2"   # light green tint
+        style = ttk.Style(self)
+        style.configure("LEA.TFrame", background=lea_bg)
+        style.configure("LEA.TLabel", background=lea_bg)
+        style.configure("LOG.TFrame", background=log_bg)
+        style.configure("LOG.TLabel", background=log_bg)
+
     def _set_initial_geometry(self) -> None:
         # Compute an initial size responsive to content and screen
         try:
@@ -398,9 +573,8 @@ class App(tk.Tk):
         if not xlsx:
             messagebox.showwarning("Eingabe fehlt", "Bitte eine LEA-Excel-Datei auswählen.")
             return
-        s = self.settings
-        s.lea_xlsx_file = xlsx
-        self._launch_thread(self._task_convert, s)
+        self.settings = replace(self.settings, lea_xlsx_file=xlsx)
+        self._launch_job("convert", self.settings)
 
     def _run_pdf(self) -> None:
         if self._running:
@@ -411,133 +585,198 @@ class App(tk.Tk):
             messagebox.showwarning("Eingabe fehlt", "Bitte eine LOGINEO-CSV- oder XLS-Datei auswählen.")
             return
         ext = os.path.splitext(path)[1].lower()
-        s = self.settings
         if ext == ".csv":
-            s.logineo_csv_file = path
-            s.logineo_xml_file = ""
-            self._launch_thread(self._task_pdf_csv, s)
+            self.settings = replace(self.settings, logineo_csv_file=path, logineo_xml_file="")
+            self._launch_job("pdf_csv", self.settings)
         elif ext in (".xls", ".xlsx"):
             try:
-                csv_path = self._convert_xls_to_csv(path, delimiter=s.logineo_csv_delimiter or ",")
+                csv_path = self._convert_xls_to_csv(path, delimiter=self.settings.logineo_csv_delimiter or ",")
             except Exception as e:
                 messagebox.showerror("Konvertierung fehlgeschlagen", f"XLS/XLSX konnte nicht gelesen werden.\n\n{e}")
                 return
-            s.logineo_csv_file = csv_path
-            s.logineo_xml_file = ""
-            self._launch_thread(self._task_pdf_csv, s)
+            self.settings = replace(self.settings, logineo_csv_file=csv_path, logineo_xml_file="")
+            self._launch_job("pdf_csv", self.settings)
         else:
             messagebox.showwarning("Falsches Format", "Unterstützt werden .csv oder .xls/.xlsx.")
 
     def _convert_xls_to_csv(self, xls_path: str, *, delimiter: str = ",") -> str:
         """Konvertiert eine XLS/XLSX nach CSV im tmp-Ordner und liefert den Pfad zurück."""
-        df = pd.read_excel(xls_path, dtype=str)
-        df.fillna("", inplace=True)
+        if not _is_workbook(xls_path):
+            # Text export with an Excel extension: already CSV, use it as-is
+            return xls_path
         tmp_dir = resolve_path("tmp")
         os.makedirs(tmp_dir, exist_ok=True)
+        abs_path = os.path.abspath(xls_path)
+        st = os.stat(abs_path)
+        # Gleiche Datei (Pfad, Änderungszeit, Größe) + Trennzeichen => vorhandene CSV wiederverwenden
+        key = hashlib.blake2b(
+            f"{abs_path}|{st.st_mtime_ns}|{st.st_size}|{delimiter}".encode("utf-8"), digest_size=12
+        ).hexdigest()
         base = os.path.splitext(os.path.basename(xls_path))[0]
-        csv_path = os.path.join(tmp_dir, f"{base}.csv")
-        df.to_csv(csv_path, index=False, encoding="utf-8", sep=delimiter)
+        csv_path = os.path.join(tmp_dir, f"{base}.{key}.csv")
+        if os.path.isfile(csv_path) and os.path.getsize(csv_path) > 0:
+            os.utime(csv_path)
+            return csv_path
+        # Zeilen direkt aus der Arbeitsmappe streamen (kein DataFrame dazwischen)
+        part_path = csv_path + ".part"
+        with open(part_path, "w", encoding="utf-8", newline="", buffering=1 << 20) as f:
+            writer = csv.writer(f, delimiter=delimiter)
+            for row in _iter_sheet_rows(xls_path):
+                if any(row):
+                    writer.writerow(row)
+        os.replace(part_path, csv_path)
         return csv_path
 
     # ---------------- Background execution ----------------
-    def _launch_thread(self, fn, s: Settings) -> None:
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        # One long-lived worker process: keeps pandas/openpyxl off the GIL of the Tk thread
+        if self._pool is None:
+            self._job_log_q = multiprocessing.Queue()
+            self._pool = ProcessPoolExecutor(
+                max_workers=1, initializer=_init_worker, initargs=(self._job_log_q,)
+            )
+            threading.Thread(target=self._consume_job_log, args=(self._job_log_q,), daemon=True).start()
+        return self._pool
+
+    def _launch_job(self, task: str, s: Settings) -> None:
         self._set_running(True)
         self._println("Starte…\n")
+        self.after(_LOG_POLL_MS, self._poll_log_queue)
 
-        t = threading.Thread(target=self._run_captured, args=(fn, s), daemon=True)
-        t.start()
-
-    def _run_captured(self, fn, s: Settings) -> None:
-        # Redirect stdout/stderr temporarily to GUI
-        old_out, old_err = sys.stdout, sys.stderr
-        stream = _TextStream(self._log_q)
-        sys.stdout = stream
-        sys.stderr = stream
-        old_env = os.environ.get("NONINTERACTIVE")
-        os.environ["NONINTERACTIVE"] = "1"
         try:
-            fn(s)
+            future = self._ensure_pool().submit(_run_job, task, asdict(s))
         except Exception:
-            traceback.print_exc()
-        finally:
-            # restore
-            if old_env is None:
-                os.environ.pop("NONINTERACTIVE", None)
-            else:
-                os.environ["NONINTERACTIVE"] = old_env
-            sys.stdout = old_out
-            sys.stderr = old_err
-            self._set_running(False)
-            self._println("\nFertig.\n")
-
-    def _task_convert(self, s: Settings) -> None:
-        LEAConverter(s).convert()
-
-    def _task_pdf_csv(self, s: Settings) -> None:
-        PDFGenerator(s).generate()
-
-    def _task_pdf_xml(self, s: Settings) -> None:
-        PDFGenerator(s).generate_from_xml()
+            self._println(traceback.format_exc())
+            self._reset_pool()
+            self._job_finished()
+            return
+        # Runs on the executor's thread: hand the future to the Tk thread via the queue
+        future.add_done_callback(lambda f: self._log_q.put((_FUTURE_DONE, f)))
+
+    def _consume_job_log(self, log_q) -> None:
+        # Forwards worker output (incl. _JOB_DONE) to the GUI queue; None ends the thread.
+        # No Tk calls here: Tk is only touched from the main thread.
+        while True:
+            item = log_q.get()
+            if item is None:
+                return
+            self._log_q.put(item)
+
+    def _on_job_future_done(self, future) -> None:
+        # _run_job handles its own errors; an exception here means the worker process died
+        exc = future.exception()
+        if exc is not None:
+            self._println(f"\nDer Hintergrundprozess wurde unerwartet beendet: {exc}\n")
+            self._reset_pool()
+            self._job_finished()
+
+    def _job_finished(self) -> None:
+        if not self._running:
+            return
+        self._set_running(False)
+        self._println("\nFertig.\n")
+
+    def _reset_pool(self) -> None:
+        pool, log_q = self._pool, self._job_log_q
+        self._pool = None
+        self._job_log_q = None
+        if pool is not None:
+            # shutdown() cannot stop a running job, and the atexit hook of concurrent.futures
+            # would wait for it -> end the worker process explicitly. _processes is private
+            # CPython API: if it is missing, a running job is only cancelled once it finishes.
+            processes = getattr(pool, "_processes", None) or {}
+            for proc in list(processes.values()):
+                proc.terminate()
+            pool.shutdown(wait=False, cancel_futures=True)
+        if log_q is not None:
+            log_q.put(None)
+
+    def _on_close(self) -> None:
+        self._reset_pool()
+        self.destroy()
 
     # ---------------- Logging ----------------
     def _println(self, text: str) -> None:
+        # Tk thread only; goes through the queue to keep the order with worker output
         self._log_q.put(text)
+        self._drain_log_queue()
+
+    def _poll_log_queue(self) -> None:
+        # Polls only while a job runs; idle windows do no periodic work
+        self._drain_log_queue()
+        if self._running:
+            self.after(_LOG_POLL_MS, self._poll_log_queue)
 
     def _drain_log_queue(self) -> None:
-        try:
-            while True:
-                chunk = self._log_q.get_nowait()
-                self._append_text(chunk)
-        except queue.Empty:
-            pass
-        self.after(80, self._drain_log_queue)
+        chunks: list[str] = []
+        while True:
+            try:
+                item = self._log_q.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, str) and item != _JOB_DONE:
+                chunks.append(item)
+                continue
+            # Control item: flush the text before it, then handle it on the Tk thread
+            if chunks:
+                self._append_text("".join(chunks))
+                chunks = []
+            if item == _JOB_DONE:
+                self._job_finished()
+            else:
+                self._on_job_future_done(item[1])
+        if chunks:
+            # One insert per wakeup instead of one per queued chunk
+            self._append_text("".join(chunks))
 
     def _append_text(self, s: str) -> None:
         self.txt.configure(state=tk.NORMAL)
         self.txt.insert(tk.END, s)
+        # Keep the widget bounded so inserts stay cheap on very chatty runs
+        lines = int(self.txt.index("end-1c").split(".")[0])
+        if lines > _LOG_MAX_LINES:
+            self.txt.delete("1.0", f"{lines - _LOG_MAX_LINES + 1}.0")
         self.txt.see(tk.END)
         self.txt.configure(state=tk.DISABLED)
 
 
 class SettingsDialog(tk.Toplevel):
+    """Settings window; built once and reused via show() (see App._show_settings)."""
+
+    # Combobox options for the LEA output format, built once at import time
+    _LEA_FORMAT_OPTIONS = (
+        ("csv", "CSV"),
+        ("xlsx", "XLSX (nicht empfohlen)"),
+    )
+    _LEA_FORMAT_LABEL_BY_VALUE = MappingProxyType({value: label for value, label in _LEA_FORMAT_OPTIONS})
+    _LEA_FORMAT_VALUE_BY_LABEL = MappingProxyType({label: value for value, label in _LEA_FORMAT_OPTIONS})
+
     def __init__(self, parent: App, settings: Settings, on_save, section: str | None = None) -> None:
         super().__init__(parent)
+        self.withdraw()
         self.title("Einstellungen")
         self.transient(parent)
-        self.grab_set()
         self.resizable(True, True)
 
         self._parent = parent
         self._orig = settings
         self._on_save = on_save
-        self._section = (section or "all").lower()
-
-        def yesno_to_bool(v: str) -> bool:
-            return (v or "").strip().lower() == "ja"
 
-        # Variables
-        self.var_primary = tk.StringVar(value=settings.lea_primary_key or "LEAID")
-        self.var_laa_lehramt = tk.BooleanVar(value=yesno_to_bool(settings.lea_gruppe_laa_lehramt))
-        self.var_laa_jg = tk.BooleanVar(value=yesno_to_bool(settings.lea_gruppe_laa_lehramt_jg))
-        self.var_laa_seminare = tk.BooleanVar(value=yesno_to_bool(settings.lea_gruppe_laa_seminare))
-        self.var_lea_out = tk.StringVar(value=settings.lea_outputpath or "output")
-        self._lea_format_options = [
-            ("csv", "CSV"),
-            ("xlsx", "XLSX (nicht empfohlen)"),
-        ]
-        self._lea_format_label_by_value = {value: label for value, label in self._lea_format_options}
-        self._lea_format_value_by_label = {label: value for value, label in self._lea_format_options}
-        fmt_value = (settings.lea_output_format or "csv").strip().lower()
-        default_label = self._lea_format_label_by_value.get(fmt_value, self._lea_format_label_by_value.get("csv", "CSV"))
-        self.var_lea_format = tk.StringVar(value=default_label)
-
-        self.var_csv_delim = tk.StringVar(value=settings.logineo_csv_delimiter or ",")
-        self.var_pdf_out = tk.StringVar(value=settings.pdf_outputpath or "pdf-files")
-        self.var_logineo_link = tk.StringVar(value=settings.pdf_logineolink)
-        self.var_support_name = tk.StringVar(value=settings.pdf_supportname)
-        self.var_support_mail = tk.StringVar(value=settings.pdf_supportmail)
-        self.var_pdf_einzeln = tk.BooleanVar(value=yesno_to_bool(settings.pdf_einzeln))
-        self.var_pdf_lehramt = tk.BooleanVar(value=yesno_to_bool(settings.pdf_lehramt))
+        # Variables (filled from the current settings in show())
+        self.var_primary = tk.StringVar()
+        self.var_laa_lehramt = tk.BooleanVar()
+        self.var_laa_jg = tk.BooleanVar()
+        self.var_laa_seminare = tk.BooleanVar()
+        self.var_lea_out = tk.StringVar()
+        self.var_lea_format = tk.StringVar()
+
+        self.var_csv_delim = tk.StringVar()
+        self.var_pdf_out = tk.StringVar()
+        self.var_logineo_link = tk.StringVar()
+        self.var_support_name = tk.StringVar()
+        self.var_support_mail = tk.StringVar()
+        self.var_pdf_einzeln = tk.BooleanVar()
+        self.var_pdf_lehramt = tk.BooleanVar()
 
         # XML mapping settings are no longer managed via GUI
 
@@ -545,68 +784,107 @@ class SettingsDialog(tk.Toplevel):
         body.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
         # LEA
-        if self._section in ("lea", "all"):
-            frm_lea = ttk.LabelFrame(body, text="LEA")
-            frm_lea.pack(fill=tk.X, padx=4, pady=6)
-            ttk.Label(frm_lea, text="Primärschlüssel:").grid(row=0, column=0, sticky=tk.W, padx=4, pady=4)
-            cmb = ttk.Combobox(frm_lea, textvariable=self.var_primary, values=["LEAID", "IdentNr"], state="readonly", width=12)
-            cmb.grid(row=0, column=1, sticky=tk.W, padx=4, pady=4)
-            ttk.Checkbutton(frm_lea, text="Gruppe LAA_LEHRAMT", variable=self.var_laa_lehramt).grid(row=1, column=0, columnspan=2, sticky=tk.W, padx=4, pady=2)
-            ttk.Checkbutton(frm_lea, text="Gruppe LAA_LEHRAMT_JG", variable=self.var_laa_jg).grid(row=2, column=0, columnspan=2, sticky=tk.W, padx=4, pady=2)
-            ttk.Checkbutton(frm_lea, text="Seminar-Gruppen", variable=self.var_laa_seminare).grid(row=3, column=0, columnspan=2, sticky=tk.W, padx=4, pady=2)
-            ttk.Label(frm_lea, text="LEA-Ausgabeordner:").grid(row=4, column=0, sticky=tk.W, padx=4, pady=4)
-            ttk.Entry(frm_lea, textvariable=self.var_lea_out, width=50).grid(row=4, column=1, sticky=tk.W, padx=4, pady=4)
-            ttk.Button(frm_lea, text="…", width=3, command=self._pick_lea_outdir).grid(row=4, column=2, padx=4, pady=4)
-            ttk.Label(frm_lea, text="Ausgabeformat:").grid(row=5, column=0, sticky=tk.W, padx=4, pady=4)
-            ttk.Combobox(
-                frm_lea,
-                textvariable=self.var_lea_format,
-                values=[label for _, label in self._lea_format_options],
-                state="readonly",
-                width=28,
-            ).grid(row=5, column=1, sticky=tk.W, padx=4, pady=4)
-            ttk.Label(frm_lea, text="Hinweis: Die LEA-Excel-Datei wird im Hauptfenster gewaehlt.", foreground="#555").grid(row=6, column=0, columnspan=3, sticky=tk.W, padx=4, pady=(2, 2))
+        frm_lea = ttk.LabelFrame(body, text="LEA")
+        ttk.Label(frm_lea, text="Primärschlüssel:").grid(row=0, column=0, sticky=tk.W, padx=4, pady=4)
+        cmb = ttk.Combobox(frm_lea, textvariable=self.var_primary, values=["LEAID", "IdentNr"], state="readonly", width=12)
+        cmb.grid(row=0, column=1, sticky=tk.W, padx=4, pady=4)
+        ttk.Checkbutton(frm_lea, text="Gruppe LAA_LEHRAMT", variable=self.var_laa_lehramt).grid(row=1, column=0, columnspan=2, sticky=tk.W, padx=4, pady=2)
+        ttk.Checkbutton(frm_lea, text="Gruppe LAA_LEHRAMT_JG", variable=self.var_laa_jg).grid(row=2, column=0, columnspan=2, sticky=tk.W, padx=4, pady=2)
+        ttk.Checkbutton(frm_lea, text="Seminar-Gruppen", variable=self.var_laa_seminare).grid(row=3, column=0, columnspan=2, sticky=tk.W, padx=4, pady=2)
+        ttk.Label(frm_lea, text="LEA-Ausgabeordner:").grid(row=4, column=0, sticky=tk.W, padx=4, pady=4)
+        ttk.Entry(frm_lea, textvariable=self.var_lea_out, width=50).grid(row=4, column=1, sticky=tk.W, padx=4, pady=4)
+        ttk.Button(frm_lea, text="…", width=3, command=self._pick_lea_outdir).grid(row=4, column=2, padx=4, pady=4)
+        ttk.Label(frm_lea, text="Ausgabeformat:").grid(row=5, column=0, sticky=tk.W, padx=4, pady=4)
+        ttk.Combobox(
+            frm_lea,
+            textvariable=self.var_lea_format,
+            values=[label for _, label in self._LEA_FORMAT_OPTIONS],
+            state="readonly",
+            width=28,
+        ).grid(row=5, column=1, sticky=tk.W, padx=4, pady=4)
+        ttk.Label(frm_lea, text="Hinweis: Die LEA-Excel-Datei wird im Hauptfenster gewaehlt.", foreground="#555").grid(row=6, column=0, columnspan=3, sticky=tk.W, padx=4, pady=(2, 2))
 
         # LOGINEO Optionen
-        if self._section in ("logineo", "all"):
-            frm_log = ttk.LabelFrame(body, text="LOGINEO Optionen")
-            frm_log.pack(fill=tk.X, padx=4, pady=6)
-            ttk.Label(frm_log, text="CSV-Trennzeichen:").grid(row=0, column=0, sticky=tk.W, padx=4, pady=4)
-            ttk.Entry(frm_log, textvariable=self.var_csv_delim, width=8).grid(row=0, column=1, sticky=tk.W, padx=4, pady=4)
-            ttk.Label(frm_log, text="Hinweis: LOGINEO CSV/XML-Dateien werden im Hauptfenster gewählt.", foreground="#555").grid(row=1, column=0, columnspan=3, sticky=tk.W, padx=4, pady=(2, 4))
+        frm_log = ttk.LabelFrame(body, text="LOGINEO Optionen")
+        ttk.Label(frm_log, text="CSV-Trennzeichen:").grid(row=0, column=0, sticky=tk.W, padx=4, pady=4)
+        ttk.Entry(frm_log, textvariable=self.var_csv_delim, width=8).grid(row=0, column=1, sticky=tk.W, padx=4, pady=4)
+        ttk.Label(frm_log, text="Hinweis: LOGINEO CSV/XML-Dateien werden im Hauptfenster gewählt.", foreground="#555").grid(row=1, column=0, columnspan=3, sticky=tk.W, padx=4, pady=(2, 4))
 
         # PDF & Support
-        if self._section in ("logineo", "all"):
-            frm_pdf = ttk.LabelFrame(body, text="PDF & Support")
-            frm_pdf.pack(fill=tk.X, padx=4, pady=6)
-            ttk.Label(frm_pdf, text="PDF-Ausgabeordner:").grid(row=0, column=0, sticky=tk.W, padx=4, pady=4)
-            ttk.Entry(frm_pdf, textvariable=self.var_pdf_out, width=50).grid(row=0, column=1, sticky=tk.W, padx=4, pady=4)
-            ttk.Button(frm_pdf, text="…", width=3, command=self._pick_pdf_outdir).grid(row=0, column=2, padx=4, pady=4)
-            ttk.Label(frm_pdf, text="LOGINEO-Domain:").grid(row=1, column=0, sticky=tk.W, padx=4, pady=4)
-            ttk.Entry(frm_pdf, textvariable=self.var_logineo_link, width=50).grid(row=1, column=1, sticky=tk.W, padx=4, pady=4)
-            ttk.Label(frm_pdf, text="Support-Name:").grid(row=2, column=0, sticky=tk.W, padx=4, pady=4)
-            ttk.Entry(frm_pdf, textvariable=self.var_support_name, width=50).grid(row=2, column=1, sticky=tk.W, padx=4, pady=4)
-            ttk.Label(frm_pdf, text="Support-Mail:").grid(row=3, column=0, sticky=tk.W, padx=4, pady=4)
-            ttk.Entry(frm_pdf, textvariable=self.var_support_mail, width=50).grid(row=3, column=1, sticky=tk.W, padx=4, pady=4)
-            ttk.Checkbutton(frm_pdf, text="Einzel-PDFs", variable=self.var_pdf_einzeln).grid(row=4, column=0, sticky=tk.W, padx=4, pady=2)
-            ttk.Checkbutton(frm_pdf, text="PDF pro Lehramt", variable=self.var_pdf_lehramt).grid(row=4, column=1, sticky=tk.W, padx=4, pady=2)
-            ttk.Label(frm_pdf, text="Hinweis: Der PDF-Ausgabeordner kann oben gesetzt werden.", foreground="#555").grid(row=5, column=0, columnspan=3, sticky=tk.W, padx=4, pady=(2, 4))
+        frm_pdf = ttk.LabelFrame(body, text="PDF & Support")
+        ttk.Label(frm_pdf, text="PDF-Ausgabeordner:").grid(row=0, column=0, sticky=tk.W, padx=4, pady=4)
+        ttk.Entry(frm_pdf, textvariable=self.var_pdf_out, width=50).grid(row=0, column=1, sticky=tk.W, padx=4, pady=4)
+        ttk.Button(frm_pdf, text="…", width=3, command=self._pick_pdf_outdir).grid(row=0, column=2, padx=4, pady=4)
+        ttk.Label(frm_pdf, text="LOGINEO-Domain:").grid(row=1, column=0, sticky=tk.W, padx=4, pady=4)
+        ttk.Entry(frm_pdf, textvariable=self.var_logineo_link, width=50).grid(row=1, column=1, sticky=tk.W, padx=4, pady=4)
+        ttk.Label(frm_pdf, text="Support-Name:").grid(row=2, column=0, sticky=tk.W, padx=4, pady=4)
+        ttk.Entry(frm_pdf, textvariable=self.var_support_name, width=50).grid(row=2, column=1, sticky=tk.W, padx=4, pady=4)
+        ttk.Label(frm_pdf, text="Support-Mail:").grid(row=3, column=0, sticky=tk.W, padx=4, pady=4)
+        ttk.Entry(frm_pdf, textvariable=self.var_support_mail, width=50).grid(row=3, column=1, sticky=tk.W, padx=4, pady=4)
+        ttk.Checkbutton(frm_pdf, text="Einzel-PDFs", variable=self.var_pdf_einzeln).grid(row=4, column=0, sticky=tk.W, padx=4, pady=2)
+        ttk.Checkbutton(frm_pdf, text="PDF pro Lehramt", variable=self.var_pdf_lehramt).grid(row=4, column=1, sticky=tk.W, padx=4, pady=2)
+        ttk.Label(frm_pdf, text="Hinweis: Der PDF-Ausgabeordner kann oben gesetzt werden.", foreground="#555").grid(row=5, column=0, columnspan=3, sticky=tk.W, padx=4, pady=(2, 4))
 
         # XML mapping section removed from GUI
+        self._section_frames = {"lea": (frm_lea,), "logineo": (frm_log, frm_pdf)}
 
         # Buttons
         frm_btn = ttk.Frame(self)
         frm_btn.pack(fill=tk.X, padx=10, pady=10)
-        ttk.Button(frm_btn, text="Abbrechen", command=self.destroy).pack(side=tk.RIGHT)
+        ttk.Button(frm_btn, text="Abbrechen", command=self._hide).pack(side=tk.RIGHT)
         ttk.Button(frm_btn, text="Speichern", command=self._save).pack(side=tk.RIGHT, padx=8)
 
-        self.bind("<Escape>", lambda e: self.destroy())
+        self.bind("<Escape>", lambda e: self._hide())
+        self.protocol("WM_DELETE_WINDOW", self._hide)
+
+        self.show(section, settings)
+
+    def show(self, section: str | None, settings: Settings) -> None:
+        """Resets the fields from `settings` and shows the requested section(s)."""
+        def yesno_to_bool(v: str) -> bool:
+            return (v or "").strip().lower() == "ja"
+
+        self._orig = settings
+        self.var_primary.set(settings.lea_primary_key or "LEAID")
+        self.var_laa_lehramt.set(yesno_to_bool(settings.lea_gruppe_laa_lehramt))
+        self.var_laa_jg.set(yesno_to_bool(settings.lea_gruppe_laa_lehramt_jg))
+        self.var_laa_seminare.set(yesno_to_bool(settings.lea_gruppe_laa_seminare))
+        self.var_lea_out.set(settings.lea_outputpath or "output")
+        fmt_value = (settings.lea_output_format or "csv").strip().lower()
+        self.var_lea_format.set(self._LEA_FORMAT_LABEL_BY_VALUE.get(fmt_value, self._LEA_FORMAT_LABEL_BY_VALUE["csv"]))
+
+        self.var_csv_delim.set(settings.logineo_csv_delimiter or ",")
+        self.var_pdf_out.set(settings.pdf_outputpath or "pdf-files")
+        self.var_logineo_link.set(settings.pdf_logineolink)
+        self.var_support_name.set(settings.pdf_supportname)
+        self.var_support_mail.set(settings.pdf_supportmail)
+        self.var_pdf_einzeln.set(yesno_to_bool(settings.pdf_einzeln))
+        self.var_pdf_lehramt.set(yesno_to_bool(settings.pdf_lehramt))
+
+        # Only (re)pack the frames of the requested section
+        section = (section or "all").lower()
+        for frames in self._section_frames.values():
+            for frm in frames:
+                frm.pack_forget()
+        for key, frames in self._section_frames.items():
+            if section in (key, "all"):
+                for frm in frames:
+                    frm.pack(fill=tk.X, padx=4, pady=6)
+
+        self.deiconify()
+        self.lift()
+        self.grab_set()
+        self.focus_set()
+
+    def _hide(self) -> None:
+        self.grab_release()
+        self.withdraw()
 
     def _save(self) -> None:
         def yn(b: bool) -> str:
             return "ja" if b else "nein"
         fmt_label = self.var_lea_format.get()
-        lea_output_format = self._lea_format_value_by_label.get(fmt_label, "csv")
+        lea_output_format = self._LEA_FORMAT_VALUE_BY_LABEL.get(fmt_label, "csv")
 
         s = Settings(
             # LEA (Pfade bleiben unverändert, nur Optionen übernehmen)
@@ -639,7 +917,7 @@ class SettingsDialog(tk.Toplevel):
         )
         try:
             self._on_save(s)
-            self.destroy()
+            self._hide()
         except Exception as e:
             messagebox.showerror("Einstellungen", str(e))
 
@@ -1,26 +1,44 @@
 ﻿from __future__ import annotations
 
+import copy
 import csv
+import functools
+import io
 import os
-import time
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
-from typing import Dict, List, Tuple, Callable
+from typing import Dict, Iterable, List, Tuple, Callable
 import xml.etree.ElementTree as ET
 
 from reportlab.lib.enums import TA_JUSTIFY
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
+from reportlab.lib.utils import ImageReader
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
+try:
+    import pyarrow as pa  # optional: mehrfädiger CSV-Parser
+    import pyarrow.csv as pa_csv
+except ImportError:  # Fallback: csv-Modul der Standardbibliothek
+    pa = pa_csv = None
+
 from .io_utils import resolve_path, ensure_dir, pause
 from .settings import Settings
 from xml.sax.saxutils import escape as xml_escape
 
 
+@functools.lru_cache(maxsize=1)
 def _register_unicode_font() -> str:
+    """Registriert den Unicode-Font einmal pro Prozess; Fallback: Helvetica."""
+    font_name = "AppUnicode"
+    if font_name in pdfmetrics.getRegisteredFontNames():
+        return font_name
     candidates = [
         os.path.join(os.environ.get("WINDIR", r"C:\\Windows"), "Fonts", "arial.ttf"),
         os.path.join(os.environ.get("WINDIR", r"C:\\Windows"), "Fonts", "Calibri.ttf"),
@@ -29,7 +47,6 @@ def _register_unicode_font() -> str:
         "/Library/Fonts/Arial.ttf",
         "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
     ]
-    font_name = "AppUnicode"
     for path in candidates:
         try:
             if path and os.path.isfile(path):
@@ -40,6 +57,92 @@ def _register_unicode_font() -> str:
     return "Helvetica"
 
 
+# Eine Prüfung pro Zelle: Präfix Seminar_/LAA_ und ob irgendwo ein "@" vorkommt
+_CELL_RE = re.compile(r"(?:(Seminar_)|(LAA_))?(.*@)?", re.S)
+
+# Element-Namen, die in einer LOGINEO-XML einen Nutzer-Datensatz darstellen
+# (Reihenfolge = Reihenfolge der Datensätze im Ergebnis, wie zuvor bei findall je Tag)
+_XML_USER_TAGS = ("user", "account", "person", "record", "row", "eintrag", "datensatz")
+
+# Zuordnung der XML-Tag-Namen (kleingeschrieben) zu den Nutzerfeldern
+_TAG_LASTNAME_RE = re.compile(r"nachname|lastname|surname")
+_TAG_FIRSTNAME_RE = re.compile(r"vorname|firstname|givenname|given_name")
+_TAG_PASSWORD_RE = re.compile(r"kennwort|password")
+_TAG_SAFE_RE = re.compile(r"safe")  # deckt auch "datensafe" ab
+_TAG_TYP_RE = re.compile(r"system|typ")  # "typ" deckt auch "type" ab
+
+
+@dataclass(slots=True)
+class UserRec:
+    """Ein Nutzer aus der LOGINEO-CSV/-XML; jedes Feld kann mehrfach vorkommen."""
+
+    nachname: List[str] = field(default_factory=list)
+    vorname: List[str] = field(default_factory=list)
+    email: List[str] = field(default_factory=list)
+    seminar: List[str] = field(default_factory=list)
+    gruppe: List[str] = field(default_factory=list)
+    kennwort: List[str] = field(default_factory=list)
+    datensafe: List[str] = field(default_factory=list)
+    typ: List[str] = field(default_factory=list)
+    # (Typ, Lehramt) für die Sammel-PDFs; setzen die Reader beim Einlesen
+    group_key: Tuple[str, str] = ("", "")
+
+
+# Ab so vielen PDFs lohnt sich das Rendern in mehreren Prozessen
+_PARALLEL_MIN_JOBS = 8
+
+# Renderer des jeweiligen Worker-Prozesses (siehe _init_render_worker)
+_worker_renderer: "PDFGenerator | None" = None
+
+
+def _init_render_worker(settings: dict) -> None:
+    """Initializer der Render-Prozesse: eigener PDFGenerator inkl. Font-Registrierung."""
+    global _worker_renderer
+    _worker_renderer = PDFGenerator(
+        Settings(**settings), log=lambda _msg: None, interactive=False, parallel=False
+    )
+
+
+def _render_job(job: Tuple) -> str:
+    _worker_renderer._render_pdf(*job)
+    return job[1]
+
+
+_needs_escape = re.compile(r"[&<>]").search
+
+
+def _xml_text(value: str) -> str:
+    """xml_escape nur, wenn der Text überhaupt &, < oder > enthält (Normalfall: nein)."""
+    return xml_escape(value) if _needs_escape(value) else value
+
+
+def _arrow_csv_rows(csv_path: str, delimiter: str) -> Tuple[List[str], Iterable] | None:
+    """Liest die CSV mit pyarrow; alle Spalten als Text, Zeilen wie beim csv-Modul."""
+    with open(csv_path, encoding="utf-8", newline="") as f:
+        header = next(csv.reader(f, delimiter=delimiter), None)
+    if header is None:
+        return None
+    table = pa_csv.read_csv(
+        csv_path,
+        read_options=pa_csv.ReadOptions(column_names=header, skip_rows=1, block_size=4 << 20, use_threads=True),
+        parse_options=pa_csv.ParseOptions(delimiter=delimiter, newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(column_types={name: pa.string() for name in header}),
+    )
+    return header, zip(*(column.to_pylist() for column in table.columns))
+
+
+@functools.lru_cache(maxsize=1)
+def _logo_reader() -> ImageReader:
+    """Logo einmal von der Platte lesen; der Reader hält die dekodierten Pixel für alle PDFs."""
+    with open(resolve_path("assets/LOGINEO-NRW.png"), "rb") as f:
+        return ImageReader(io.BytesIO(f.read()))
+
+
+def _copies(flowables: Tuple) -> List:
+    """Flache Kopien vorgefertigter Flowables (doc.build legt Layout-Zustand darauf ab)."""
+    return [copy.copy(f) for f in flowables]
+
+
 def _make_styles(font_name: str):
     styles = getSampleStyleSheet()
     for key in ("Normal", "BodyText", "Title", "Heading1", "Heading2", "Heading3"):
@@ -51,60 +154,61 @@ def _make_styles(font_name: str):
 
 
 class PDFGenerator:
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        log: Callable[[str], None] = print,
+        *,
+        interactive: bool = True,
+        parallel: bool = True,
+    ) -> None:
         self.s = settings
+        # Ausgaben laufen über log (Konsole: print, GUI: Protokoll-Fenster)
+        self._log = log
+        # Ohne Konsole (GUI) wird nie auf Tastendruck gewartet
+        self._interactive = interactive
+        # False: alle PDFs in diesem Prozess rendern (nur für die Render-Worker selbst)
+        self._parallel = parallel
         self.output_dir = resolve_path(self.s.pdf_outputpath)
         ensure_dir(self.output_dir)
         self.tmp_dir = resolve_path("tmp")
         ensure_dir(self.tmp_dir)
+        # Bereits angelegte Unterordner (Seminar/Typ) – spart wiederholte makedirs-Aufrufe
+        self._dirs_created: set = set()
 
         self._font_name = _register_unicode_font()
         self.styles = _make_styles(self._font_name)
+        # Häufig genutzte Stile direkt binden (Justify legt _make_styles immer an)
+        self._style_justify = self.styles["Justify"]
+        self._style_heading1 = self.styles["Heading1"]
+        # Für alle Nutzer gleiche Textbausteine nur einmal aufbauen
+        self._static = self._make_static_flowables()
+
+    def _pause(self, msg: str | None = None) -> None:
+        if self._interactive:
+            pause(msg)
+
+    def _ensure_dir_once(self, path: str) -> None:
+        if path not in self._dirs_created:
+            ensure_dir(path)
+            self._dirs_created.add(path)
 
     # ---------------- Public API ----------------
     def generate(self) -> None:
         csv_path = resolve_path(self.s.logineo_csv_file)
         if not os.path.isfile(csv_path):
-            print("FEHLER!")
-            print(f"Die CSV-Datei ({csv_path}) wurde nicht gefunden.")
-            pause()
+            self._log("FEHLER!")
+            self._log(f"Die CSV-Datei ({csv_path}) wurde nicht gefunden.")
+            self._pause()
             raise FileNotFoundError(csv_path)
 
-        print("")
-        print("Das Tool generiert nun PDF-Dateien aus Ihrer LOGINEO-CSV.")
-        pause("Bitte drücken Sie eine beliebige Taste, um den Prozess zu starten.")
-        print("\nHier eine Übersicht der importierten Nutzer:\n")
+        self._log("")
+        self._log("Das Tool generiert nun PDF-Dateien aus Ihrer LOGINEO-CSV.")
+        self._pause("Bitte drücken Sie eine beliebige Taste, um den Prozess zu starten.")
+        self._log("\nHier eine Übersicht der importierten Nutzer:\n")
 
-        usertable: Dict[str, Dict[str, List[str]]] = self._read_csv_to_usertable(csv_path)
-
-        do_individual = self._truthy(self.s.pdf_einzeln)
-        do_grouped = self._truthy(self.s.pdf_lehramt)
-        if not do_individual and not do_grouped:
-            do_individual = True
-
-        exported_any = False
-        msgs: List[str] = []
-
-        if do_individual and self._export_individual(usertable):
-            exported_any = True
-            msgs.append("Einzel-PDFs")
-
-        if do_grouped and self._export_grouped(usertable):
-            exported_any = True
-            msgs.append("Sammel-PDFs pro Lehramt/Typ")
-
-        if exported_any:
-            print("")
-            print("================================================================================")
-            print("Erfolg: PDF-Dateien erzeugt:", " und ".join(msgs))
-            print(f"Ergebnisse wurden im Output-Ordner abgelegt: '{self.output_dir}'.")
-            print("================================================================================")
-            print("")
-            pause("Drücken Sie eine beliebige Taste, um den Prozess zu beenden.")
-        else:
-            print("\nIhre Datei enthält keine Nutzer, für die ein Kennwort generiert wurde. Es wurde keine PDF-Datei erzeugt.")
-            pause()
-            raise SystemExit(1)
+        usertable: List[UserRec] = self._read_csv_to_usertable(csv_path)
+        self._report(self._render_all(usertable))
 
     def generate_from_xml(self, xml_path: str | None = None) -> None:
         src = xml_path or getattr(self.s, 'logineo_xml_file', '') or ''
@@ -113,314 +217,351 @@ class PDFGenerator:
             raise ValueError("Kein XML-Pfad angegeben.")
         xml_abs = resolve_path(src)
         if not os.path.isfile(xml_abs):
-            print("FEHLER!")
-            print(f"Die XML-Datei ({xml_abs}) wurde nicht gefunden.")
-            pause()
+            self._log("FEHLER!")
+            self._log(f"Die XML-Datei ({xml_abs}) wurde nicht gefunden.")
+            self._pause()
             raise FileNotFoundError(xml_abs)
 
-        print("")
-        print("Das Tool generiert nun PDF-Dateien aus Ihrer LOGINEO-XML.")
-        pause("Bitte drücken Sie eine beliebige Taste, um den Prozess zu starten.")
-        print("\nHier eine Übersicht der importierten Nutzer (aus XML):\n")
+        self._log("")
+        self._log("Das Tool generiert nun PDF-Dateien aus Ihrer LOGINEO-XML.")
+        self._pause("Bitte drücken Sie eine beliebige Taste, um den Prozess zu starten.")
+        self._log("\nHier eine Übersicht der importierten Nutzer (aus XML):\n")
 
         usertable = self._read_xml_to_usertable(xml_abs)
+        self._report(self._render_all(usertable))
 
+    def _render_all(self, usertable: List[UserRec]) -> List[str]:
+        """Erzeugt alle PDFs laut Einstellungen, ohne Rückfragen; liefert die erzeugten Arten."""
         do_individual = self._truthy(self.s.pdf_einzeln)
         do_grouped = self._truthy(self.s.pdf_lehramt)
         if not do_individual and not do_grouped:
             do_individual = True
 
-        exported_any = False
+        # Ein Zeitstempel für alle Dateien dieses Laufs (Einzel- und Sammel-PDFs)
+        run_ts = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
         msgs: List[str] = []
-        if do_individual and self._export_individual(usertable):
-            exported_any = True
+        if do_individual and self._export_individual(usertable, run_ts):
             msgs.append("Einzel-PDFs")
-        if do_grouped and self._export_grouped(usertable):
-            exported_any = True
+        if do_grouped and self._export_grouped(usertable, run_ts):
             msgs.append("Sammel-PDFs pro Lehramt/Typ")
-
-        if exported_any:
-            print("")
-            print("================================================================================")
-            print("Erfolg: PDF-Dateien erzeugt:", " und ".join(msgs))
-            print(f"Ergebnisse wurden im Output-Ordner abgelegt: '{self.output_dir}'.")
-            print("================================================================================")
-            print("")
-            pause("Drücken Sie eine beliebige Taste, um den Prozess zu beenden.")
+        return msgs
+
+    def _report(self, msgs: List[str]) -> None:
+        if msgs:
+            self._log("")
+            self._log("================================================================================")
+            self._log("Erfolg: PDF-Dateien erzeugt: " + " und ".join(msgs))
+            self._log(f"Ergebnisse wurden im Output-Ordner abgelegt: '{self.output_dir}'.")
+            self._log("================================================================================")
+            self._log("")
+            self._pause("Drücken Sie eine beliebige Taste, um den Prozess zu beenden.")
         else:
-            print("\nIhre Datei enthält keine Nutzer, für die ein Kennwort generiert wurde. Es wurde keine PDF-Datei erzeugt.")
-            pause()
+            self._log("\nIhre Datei enthält keine Nutzer, für die ein Kennwort generiert wurde. Es wurde keine PDF-Datei erzeugt.")
+            self._pause()
             raise SystemExit(1)
 
     # ---------------- CSV -> usertable ----------------
-    def _read_csv_to_usertable(self, csv_path: str) -> Dict[str, Dict[str, List[str]]]:
-        usertable: Dict[str, Dict[str, List[str]]] = {}
+    def _read_csv_to_usertable(self, csv_path: str) -> List[UserRec]:
         delimiter = (self.s.logineo_csv_delimiter or ",")
 
-        with open(csv_path, encoding="utf-8", newline="") as csvfile:
+        if pa_csv is not None:
+            try:
+                parsed = _arrow_csv_rows(csv_path, delimiter)
+            except pa.ArrowException:
+                pass  # z. B. unterschiedlich lange Zeilen: das csv-Modul ist toleranter
+            else:
+                return self._rows_to_usertable(*parsed) if parsed else []
+
+        # Großer Lesepuffer: weniger Lesezugriffe, v. a. auf Netzlaufwerken
+        with open(csv_path, encoding="utf-8", newline="", buffering=4 * 1024 * 1024) as csvfile:
             reader = csv.reader(csvfile, delimiter=delimiter)
-            header_index: Dict[str, int] | None = None
-            counter = 0
+            header = next(reader, None)
+            if header is None:
+                return []
+            return self._rows_to_usertable(header, reader)
+
+    def _rows_to_usertable(self, header: List[str], rows: Iterable) -> List[UserRec]:
+        usertable: List[UserRec] = []
+        header_index: Dict[str, int] = {name: idx for idx, name in enumerate(header)}
+        # Spaltenpositionen einmal auflösen (-1 = Spalte fehlt)
+        i_kennwort = header_index.get("Kennwort", -1)
+        i_nachname = header_index.get("Nachname", -1)
+        i_vorname = header_index.get("Vorname", -1)
+        i_safe = header_index.get("Datensafe-Kennwort", -1)
+        i_system = header_index.get("System", -1)
+
+        def cell(row: List[str], idx: int) -> str:
+            return row[idx] if idx < len(row) else ""
+
+        for row in rows:
+            if i_kennwort >= 0 and cell(row, i_kennwort) == "":
+                continue
 
-            for i, row in enumerate(reader):
-                if i == 0:
-                    header_index = {name: idx for idx, name in enumerate(row)}
+            user = UserRec()
+
+            if i_nachname >= 0:
+                user.nachname.append(cell(row, i_nachname))
+            if i_vorname >= 0:
+                user.vorname.append(cell(row, i_vorname))
+            if i_kennwort >= 0:
+                user.kennwort.append(cell(row, i_kennwort))
+            if i_safe >= 0:
+                user.datensafe.append(cell(row, i_safe))
+            if i_system >= 0:
+                user.typ.append(cell(row, i_system))
+
+            append_mail = user.email.append
+            append_seminar = user.seminar.append
+            append_gruppe = user.gruppe.append
+            # E-Mail-, Seminar- und Gruppen-Spalten kommen mehrfach vor (E-Mailadresse, Gruppe,
+            # Fachbereich, ...) -> jede Zelle der Zeile prüfen
+            for element in row:
+                val = element.strip()
+                if not val:
                     continue
+                seminar, laa, mail = _CELL_RE.match(val).groups()
+                if mail:
+                    append_mail(val)
+                if seminar:
+                    append_seminar(val)
+                elif laa:
+                    append_gruppe(val)
 
-                def has_field(field: str) -> bool:
-                    return header_index is not None and field in header_index
-
-                def get_field(field: str) -> str:
-                    if not has_field(field) or header_index is None:
-                        return ""
-                    idx = header_index.get(field)
-                    if idx is None or idx >= len(row):
-                        return ""
-                    return row[idx]
-
-                if has_field("Kennwort") and get_field("Kennwort") == "":
-                    continue
+            if not user.typ:
+                user.typ.append("SAB")
+            user.group_key = self._group_key(user)
 
-                user_key = f"user{counter}"
-                user = {
-                    "Nachname": [],
-                    "Vorname": [],
-                    "E-Mail": [],
-                    "Seminar": [],
-                    "Gruppe": [],
-                    "Kennwort": [],
-                    "Datensafe-Kennwort": [],
-                    "Typ": [],
-                }
-
-                if has_field("Nachname"):
-                    user["Nachname"].append(get_field("Nachname"))
-                if has_field("Vorname"):
-                    user["Vorname"].append(get_field("Vorname"))
-                if has_field("Kennwort"):
-                    user["Kennwort"].append(get_field("Kennwort"))
-                if has_field("Datensafe-Kennwort"):
-                    user["Datensafe-Kennwort"].append(get_field("Datensafe-Kennwort"))
-                if has_field("System"):
-                    user["Typ"].append(get_field("System"))
-
-                for element in row:
-                    if not isinstance(element, str):
-                        continue
-                    val = element.strip()
-                    if "@" in val:
-                        user["E-Mail"].append(val)
-                    if val.startswith("Seminar_"):
-                        user["Seminar"].append(val)
-                    if val.startswith("LAA_"):
-                        user["Gruppe"].append(val)
-
-                if not user["Typ"]:
-                    user["Typ"].append("SAB")
-
-                usertable[user_key] = user
-                counter += 1
+            usertable.append(user)
 
         return usertable
 
     # ---------------- Einzel-PDFs ----------------
-    def _export_individual(self, usertable: Dict[str, Dict[str, List[str]]]) -> bool:
-        any_export = False
-        for u in usertable.values():
-            seminar = self._first(u.get("Seminar"), default="Seminar_UNBEKANNT")
-            typ = self._first(u.get("Typ"), default="SAB")
-            lastname = self._first(u.get("Nachname"), default="Nachname")
-            firstname = self._first(u.get("Vorname"), default="Vorname")
+    def _export_individual(self, usertable: List[UserRec], timestamp: str) -> bool:
+        used_paths: set = set()
+        jobs: List[Tuple] = []
+        for u in usertable:
+            seminar = self._first(u.seminar, default="Seminar_UNBEKANNT")
+            typ = self._first(u.typ, default="SAB")
+            lastname = self._first(u.nachname, default="Nachname")
+            firstname = self._first(u.vorname, default="Vorname")
 
             sub_dir = os.path.join(self.output_dir, seminar, typ)
-            ensure_dir(sub_dir)
+            self._ensure_dir_once(sub_dir)
 
-            timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-            filename = f"{typ}_{lastname}, {firstname}_{timestamp}.pdf"
-            output_filepath = os.path.join(sub_dir, filename)
-            print("Es wird erstellt: " + output_filepath)
-
-            story = self._build_user_story(u)
-            doc = self._make_doc(output_filepath)
+            # Zeitstempel kommt vom Lauf; gleichnamige Personen bekommen _2, _3, ...
+            stem = f"{typ}_{lastname}, {firstname}_{timestamp}"
+            output_filepath = os.path.join(sub_dir, f"{stem}.pdf")
+            n = 1
+            while output_filepath in used_paths:
+                n += 1
+                output_filepath = os.path.join(sub_dir, f"{stem}_{n}.pdf")
+            used_paths.add(output_filepath)
 
             # Footer: leave fields empty if missing; avoid placeholders
-            disp_seminar = self._first(u.get("Seminar"))
-            disp_typ = self._first(u.get("Typ"))
-            disp_lastname = self._first(u.get("Nachname"))
-            disp_firstname = self._first(u.get("Vorname"))
+            disp_seminar = self._first(u.seminar)
+            disp_typ = self._first(u.typ)
+            disp_lastname = self._first(u.nachname)
+            disp_firstname = self._first(u.vorname)
             name_bits = [p for p in (disp_lastname, disp_firstname) if p]
             name_part = ", ".join(name_bits) if name_bits else ""
             parts = [disp_seminar, disp_typ, name_part]
             footer_text = " - ".join([p for p in parts if p])
-            page_fn = self._make_page_decorator(None, default_footer_text=footer_text)
-            doc.build(story, onFirstPage=page_fn, onLaterPages=page_fn)
-            any_export = True
-            time.sleep(0.02)
+            jobs.append(([u], output_filepath, None, footer_text))
 
-        return any_export
+        self._render_jobs(jobs)
+        return bool(jobs)
 
     # ---------------- Sammel-PDFs ----------------
-    def _export_grouped(self, usertable: Dict[str, Dict[str, List[str]]]) -> bool:
-        groups: Dict[Tuple[str, str], List[Dict[str, List[str]]]] = {}
-        for _, u in usertable.items():
-            typ = self._first(u.get("Typ"), default="SAB")
-            lehramt = self._lehramt_from_seminar(self._first(u.get("Seminar")))
-            key = (typ, lehramt)
-            groups.setdefault(key, []).append(u)
+    def _export_grouped(self, usertable: List[UserRec], timestamp: str) -> bool:
+        groups: Dict[Tuple[str, str], List[UserRec]] = defaultdict(list)
+        for u in usertable:
+            groups[u.group_key].append(u)
 
         if not groups:
             return False
 
+        jobs: List[Tuple] = []
         for (typ, lehramt), users in groups.items():
             seminar_label = f"Seminar_{lehramt}" if lehramt else "Seminar_UNBEKANNT"
             sub_dir = os.path.join(self.output_dir, seminar_label, typ)
-            ensure_dir(sub_dir)
+            self._ensure_dir_once(sub_dir)
 
-            timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
             filename = f"SAMMEL_{typ}_{lehramt or 'UNBEKANNT'}_{timestamp}.pdf"
             output_filepath = os.path.join(sub_dir, filename)
-            print("Es wird erstellt: " + output_filepath)
 
-            story: List = []
+            # Seminar und Typ sind für die ganze Gruppe gleich -> Footer-Präfix nur einmal bauen
+            prefix = f"Seminar_{lehramt} - {typ}" if lehramt else typ
             footer_map: List[str] = []
-            for idx, u in enumerate(users):
+            for u in users:
                 # Footer fields: empty if not present
-                disp_seminar = f"Seminar_{lehramt}" if lehramt else ""
-                disp_typ = self._first(u.get("Typ")) or typ
-                disp_lastname = self._first(u.get("Nachname"))
-                disp_firstname = self._first(u.get("Vorname"))
-                name_bits = [p for p in (disp_lastname, disp_firstname) if p]
-                name_part = ", ".join(name_bits) if name_bits else ""
-                parts = [disp_seminar, disp_typ, name_part]
-                footer_map.append(" - ".join([p for p in parts if p]))
-                story.extend(self._build_user_story(u))
-                if idx < (len(users) - 1):
-                    story.append(PageBreak())
+                name_bits = [p for p in (self._first(u.nachname), self._first(u.vorname)) if p]
+                footer_map.append(f"{prefix} - {', '.join(name_bits)}" if name_bits else prefix)
 
             # Default footer for pages without map entry
-            default_parts = [f"Seminar_{lehramt}" if lehramt else "", typ, "Sammel"]
-            default_footer = " - ".join([p for p in default_parts if p])
-
-            doc = self._make_doc(output_filepath)
-            page_fn = self._make_page_decorator(footer_map, default_footer_text=default_footer)
-            doc.build(story, onFirstPage=page_fn, onLaterPages=page_fn)
-            time.sleep(0.05)
+            default_footer = f"{prefix} - Sammel"
+            jobs.append((users, output_filepath, footer_map, default_footer))
 
+        self._render_jobs(jobs)
         return True
 
+    # ---------------- Rendern ----------------
+    def _render_jobs(self, jobs: List[Tuple]) -> None:
+        """Rendert alle PDFs; ab _PARALLEL_MIN_JOBS verteilt auf mehrere Prozesse."""
+        workers = min(os.cpu_count() or 1, len(jobs))
+        # Beide Wege melden jedes PDF gleich, und zwar erst, wenn es geschrieben ist
+        if not self._parallel or len(jobs) < _PARALLEL_MIN_JOBS or workers < 2:
+            for job in jobs:
+                self._render_pdf(*job)
+                self._log("Erstellt: " + job[1])
+            return
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_render_worker, initargs=(asdict(self.s),)
+        ) as pool:
+            # Fehler aus den Workern kommen hier an
+            for output_filepath in pool.map(_render_job, jobs, chunksize=8):
+                self._log("Erstellt: " + output_filepath)
+
+    def _render_pdf(
+        self,
+        users: List[UserRec],
+        output_filepath: str,
+        footer_map: List[str] | None,
+        default_footer_text: str,
+    ) -> None:
+        story: List = []
+        for idx, u in enumerate(users):
+            story.extend(self._build_user_story(u))
+            if idx < (len(users) - 1):
+                story.append(PageBreak())
+        doc = self._make_doc(output_filepath)
+        page_fn = self._make_page_decorator(footer_map, default_footer_text=default_footer_text)
+        doc.build(story, onFirstPage=page_fn, onLaterPages=page_fn)
+
     # ---------------- Bausteine ----------------
-    def _build_user_story(self, u: Dict[str, List[str]]) -> List:
+    def _make_static_flowables(self) -> Dict[str, Tuple]:
+        """Baut die nutzerunabhängigen Teile des Anschreibens einmal pro Generator."""
         styles = self.styles
-        if "Justify" not in styles.byName:
-            styles.add(ParagraphStyle(name="Justify", alignment=TA_JUSTIFY, fontName=styles["Normal"].fontName))
-
-        story: List = []
 
         # Logo
         logineologo = resolve_path("assets/LOGINEO-NRW.png")
         im = Image(logineologo, 477, 105)
         im._restrictSize(4 * cm, 8 * cm)  # type: ignore[attr-defined]
-        story.append(im)
+        # Alle Kopien teilen denselben Reader -> PNG wird nicht pro Nutzer neu dekodiert
+        im._img = _logo_reader()  # type: ignore[attr-defined]
+
+        return {
+            "logo": (im, Spacer(1, 12)),
+            "intro": (
+                Spacer(1, 12),
+                # Einleitung
+                Paragraph(
+                    "<font size=12>Mit diesem Schreiben erhalten Sie Informationen zum Anmeldeprozess "
+                    "in der ZfsL-Basis-IT-Infrastruktur, die vom Nordrhein-Westfälischen Ministerium für Schule und Bildung "
+                    "für Lehramtsanwärter und Seminarausbilder kostenlos zur Verfügung gestellt wird.</font>",
+                    styles["Normal"]
+                ),
+                Spacer(1, 12),
+                # URL
+                Paragraph(
+                    "<font size=12>Für den Zugang zu unserer Plattform müssen Sie zunächst im oberen Feld Ihres Browsers die folgende URL eingeben:</font>",
+                    styles["Normal"]
+                ),
+                Spacer(1, 12),
+                Paragraph(f"<font size=14>https://{xml_escape(self.s.pdf_logineolink)}</font>", styles["Normal"]),
+                Spacer(1, 24),
+                # Hinweise
+                Paragraph("<font size=12>Bitte beachten Sie folgende Hinweise:</font>", styles["Heading1"]),
+                Paragraph(
+                    "<font size=12>Der Zugriff erfolgt grundsätzlich nur mit zugewiesenen persönlichen Login-Daten einschließlich des Passwortes. "
+                    "Jede Person ist verantwortlich für alle Aktionen, die mit ihren Zugangsdaten ausgeführt werden. Gehen Sie deshalb sorgfältig mit "
+                    "Ihrer Zugangserkennung und Ihrem Passwort um.</font>",
+                    styles["Normal"]
+                ),
+                Spacer(1, 6),
+            ),
+            "pw_change_sab": (
+                Paragraph(
+                    "<font size=12>Nach Ihrer Erstanmeldung müssen sowohl das Zugangspasswort als auch das Passwort für den Bereich Safe geändert werden.</font>",
+                    styles["Normal"]
+                ),
+            ),
+            "pw_change_laa": (
+                Paragraph(
+                    "<font size=12>Nach Ihrer Erstanmeldung muss das Zugangspasswort geändert werden.</font>",
+                    styles["Normal"]
+                ),
+            ),
+            "usage": (
+                Spacer(1, 6),
+                Paragraph("<font size=12>Die Nutzung der Plattform ist ausschließlich für dienstliche Zwecke gestattet.</font>", styles["Normal"]),
+                Spacer(1, 6),
+                Paragraph(
+                    "<font size=12>Für die Nutzung der Basis-IT-Infrastruktur gelten die Nutzungsbedingungen, denen Sie direkt nach Ihrer Erstanmeldung "
+                    "mit den hier mitgeteilten Zugangsdaten zustimmen müssen. Diese Nutzungsbedingungen sind später im Bereich 'Mein Konto' einsehbar.</font>",
+                    styles["Normal"]
+                ),
+                Spacer(1, 24),
+                # Zugangsdaten
+                Paragraph("<font size=12>Ihre Zugangsdaten zur ZfsL-LOGINEO NRW-Plattform finden Sie im Folgenden:</font>", styles["Heading1"]),
+                Paragraph("<font size=14>Benutzername / E-Mail-Adresse:</font>", styles["Normal"]),
+                Spacer(1, 12),
+            ),
+            "login_label": (
+                Paragraph("<font size=14>Login-Kennwort:</font>", styles["Normal"]),
+                Spacer(1, 12),
+            ),
+            "safe_label": (
+                Paragraph("<font size=14>Safe-Kennwort:</font>", styles["Normal"]),
+                Spacer(1, 12),
+            ),
+            "outro": (
+                Spacer(1, 12),
+                Paragraph(
+                    "<font size=12>Tipps und Hinweise für sichere Kennwörter sowie Anleitungen, kleine Einführungsvideos und Hilfestellungen für den Umgang mit LOGINEO NRW "
+                    "finden Sie im Netzwerk von LOGINEO NRW.</font>",
+                    styles["Normal"]
+                ),
+                Spacer(1, 6),
+                Paragraph(
+                    f"<font size=12>Bei Problemen mit Ihren Zugangsdaten wenden Sie sich bitte an Ihre:n LOGINEO-NRW-Administrator:in "
+                    f"{xml_escape(self.s.pdf_supportname)} ({xml_escape(self.s.pdf_supportmail)}).</font>",
+                    styles["Normal"]
+                ),
+            ),
+        }
+
+    def _build_user_story(self, u: UserRec) -> List:
+        static = self._static
+        heading1 = self._style_heading1
+        typ = self._first(u.typ, default="SAB")
 
         # Anrede & Name
-        firstname = xml_escape(self._first(u.get("Vorname")))
-        lastname = xml_escape(self._first(u.get("Nachname")))
-        story.append(Spacer(1, 12))
-        story.append(Paragraph(f"<font size=12>Sehr geehrte/r {firstname} {lastname},</font>", styles["Justify"]))
-        story.append(Spacer(1, 12))
-
-        # Einleitung
-        story.append(Paragraph(
-            "<font size=12>Mit diesem Schreiben erhalten Sie Informationen zum Anmeldeprozess "
-            "in der ZfsL-Basis-IT-Infrastruktur, die vom Nordrhein-Westfälischen Ministerium für Schule und Bildung "
-            "für Lehramtsanwärter und Seminarausbilder kostenlos zur Verfügung gestellt wird.</font>",
-            styles["Normal"]
-        ))
-        story.append(Spacer(1, 12))
-
-        # URL
-        story.append(Paragraph(
-            "<font size=12>Für den Zugang zu unserer Plattform müssen Sie zunächst im oberen Feld Ihres Browsers die folgende URL eingeben:</font>",
-            styles["Normal"]
-        ))
-        story.append(Spacer(1, 12))
-        story.append(Paragraph(f"<font size=14>https://{xml_escape(self.s.pdf_logineolink)}</font>", styles["Normal"]))
-        story.append(Spacer(1, 24))
-
-        # Hinweise
-        story.append(Paragraph("<font size=12>Bitte beachten Sie folgende Hinweise:</font>", styles["Heading1"]))
-        story.append(Paragraph(
-            "<font size=12>Der Zugriff erfolgt grundsätzlich nur mit zugewiesenen persönlichen Login-Daten einschließlich des Passwortes. "
-            "Jede Person ist verantwortlich für alle Aktionen, die mit ihren Zugangsdaten ausgeführt werden. Gehen Sie deshalb sorgfältig mit "
-            "Ihrer Zugangserkennung und Ihrem Passwort um.</font>",
-            styles["Normal"]
-        ))
-        story.append(Spacer(1, 6))
-
-        typ = self._first(u.get("Typ"), default="SAB")
-        if typ != "LAA":
-            story.append(Paragraph(
-                "<font size=12>Nach Ihrer Erstanmeldung müssen sowohl das Zugangspasswort als auch das Passwort für den Bereich Safe geändert werden.</font>",
-                styles["Normal"]
-            ))
-        else:
-            story.append(Paragraph(
-                "<font size=12>Nach Ihrer Erstanmeldung muss das Zugangspasswort geändert werden.</font>",
-                styles["Normal"]
-            ))
-
-        story.append(Spacer(1, 6))
-        story.append(Paragraph("<font size=12>Die Nutzung der Plattform ist ausschließlich für dienstliche Zwecke gestattet.</font>", styles["Normal"]))
-        story.append(Spacer(1, 6))
-        story.append(Paragraph(
-            "<font size=12>Für die Nutzung der Basis-IT-Infrastruktur gelten die Nutzungsbedingungen, denen Sie direkt nach Ihrer Erstanmeldung "
-            "mit den hier mitgeteilten Zugangsdaten zustimmen müssen. Diese Nutzungsbedingungen sind später im Bereich 'Mein Konto' einsehbar.</font>",
-            styles["Normal"]
-        ))
-        story.append(Spacer(1, 24))
-
-        # Zugangsdaten
-        story.append(Paragraph("<font size=12>Ihre Zugangsdaten zur ZfsL-LOGINEO NRW-Plattform finden Sie im Folgenden:</font>", styles["Heading1"]))
-        story.append(Paragraph("<font size=14>Benutzername / E-Mail-Adresse:</font>", styles["Normal"]))
-        story.append(Spacer(1, 12))
+        firstname = _xml_text(self._first(u.vorname))
+        lastname = _xml_text(self._first(u.nachname))
 
         # E-Mails
-        emails = u.get("E-Mail", [])
-        for mail in emails:
-            if not isinstance(mail, str):
-                continue
-            mail_clean = xml_escape(mail.replace('"', "").strip())
-            if not mail_clean:
-                continue
-            story.append(Paragraph(f'<font size=14>{mail_clean}</font>', styles["Heading1"]))
-
-        # Login-Kennwort
-        password = xml_escape(self._first(u.get("Kennwort")))
-        story.append(Paragraph("<font size=14>Login-Kennwort:</font>", styles["Normal"]))
-        story.append(Spacer(1, 12))
-        story.append(Paragraph(f"<font size=14>{password}</font>", styles["Heading1"]))
+        mails = (_xml_text(m.replace('"', "").strip()) for m in u.email if isinstance(m, str))
 
         # Safe-Kennwort (nur SAB)
-        if typ != "LAA" and u.get("Datensafe-Kennwort"):
-            safe_pw = xml_escape(self._first(u.get("Datensafe-Kennwort")))
-            story.append(Paragraph("<font size=14>Safe-Kennwort:</font>", styles["Normal"]))
-            story.append(Spacer(1, 12))
-            story.append(Paragraph(f"<font size=14>{safe_pw}</font>", styles["Heading1"]))
-
-        story.append(Spacer(1, 12))
-        story.append(Paragraph(
-            "<font size=12>Tipps und Hinweise für sichere Kennwörter sowie Anleitungen, kleine Einführungsvideos und Hilfestellungen für den Umgang mit LOGINEO NRW "
-            "finden Sie im Netzwerk von LOGINEO NRW.</font>",
-            styles["Normal"]
-        ))
-        story.append(Spacer(1, 6))
-        story.append(Paragraph(
-            f"<font size=12>Bei Problemen mit Ihren Zugangsdaten wenden Sie sich bitte an Ihre:n LOGINEO-NRW-Administrator:in "
-            f"{xml_escape(self.s.pdf_supportname)} ({xml_escape(self.s.pdf_supportmail)}).</font>",
-            styles["Normal"]
-        ))
-
-        return story
+        safe: List = []
+        if typ != "LAA" and u.datensafe:
+            safe_pw = _xml_text(self._first(u.datensafe))
+            safe = [*_copies(static["safe_label"]), Paragraph(f"<font size=14>{safe_pw}</font>", heading1)]
+
+        # Die ganze Seite in einem Listen-Literal: Logo, Anrede, Einleitung/URL/Hinweise,
+        # Kennwortwechsel, Nutzung, Zugangsdaten, Schluss
+        return [
+            *_copies(static["logo"]),
+            Paragraph(f"<font size=12>Sehr geehrte/r {firstname} {lastname},</font>", self._style_justify),
+            *_copies(static["intro"]),
+            *_copies(static["pw_change_sab"] if typ != "LAA" else static["pw_change_laa"]),
+            *_copies(static["usage"]),
+            *(Paragraph(f'<font size=14>{mail}</font>', heading1) for mail in mails if mail),
+            *_copies(static["login_label"]),
+            Paragraph(f"<font size=14>{_xml_text(self._first(u.kennwort))}</font>", heading1),
+            *safe,
+            *_copies(static["outro"]),
+        ]
 
     def _make_doc(self, output_filepath: str) -> SimpleDocTemplate:
         return SimpleDocTemplate(
@@ -465,6 +606,10 @@ class PDFGenerator:
             return default
         return (lst[0] or default)
 
+    @classmethod
+    def _group_key(cls, user: UserRec) -> Tuple[str, str]:
+        return cls._first(user.typ, default="SAB"), cls._lehramt_from_seminar(cls._first(user.seminar))
+
     @staticmethod
     def _lehramt_from_seminar(seminar_value: str) -> str:
         if not seminar_value:
@@ -473,74 +618,83 @@ class PDFGenerator:
             return seminar_value[len("Seminar_"):]
         return seminar_value
 
-    def _read_xml_to_usertable(self, xml_path: str) -> Dict[str, Dict[str, List[str]]]:
+    def _read_xml_to_usertable(self, xml_path: str) -> List[UserRec]:
+        # Datensätze je Tag in Dokumentreihenfolge (Platz wird beim Start-Event reserviert)
+        buckets: Dict[str, List[UserRec | None]] = {tag: [] for tag in _XML_USER_TAGS}
+        slots: Dict[ET.Element, int] = {}
+        root: ET.Element | None = None
+        open_records = 0
+
+        # Einmal streamend durch die Datei; fertige Datensätze gleich wieder freigeben
+        for event, el in ET.iterparse(xml_path, events=("start", "end")):
+            bucket = buckets.get(el.tag)
+            if event == "start":
+                if root is None:
+                    root = el
+                elif bucket is not None:
+                    slots[el] = len(bucket)
+                    bucket.append(None)
+                    open_records += 1
+                continue
+            if bucket is not None and el is not root:
+                bucket[slots.pop(el)] = self._xml_node_to_user(el)
+                open_records -= 1
+                # Verschachtelte Datensätze erst freigeben, wenn auch der äußerste fertig ist
+                if not open_records:
+                    el.clear()
+
+        usertable: List[UserRec] = [u for tag in _XML_USER_TAGS for u in buckets[tag]]
+
+        # Keine bekannten Datensatz-Tags: Kinder der Wurzel (bzw. die Wurzel selbst) verwenden
+        if not usertable and root is not None:
+            for node in (list(root) or [root]):
+                usertable.append(self._xml_node_to_user(node))
+
+        return usertable
+
+    def _xml_node_to_user(self, node: ET.Element) -> UserRec:
         def norm(s: str) -> str:
             return s.strip() if isinstance(s, str) else ""
 
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
-
-        candidates: List[ET.Element] = []
-        for tag in ("user", "account", "person", "record", "row", "eintrag", "datensatz"):
-            candidates.extend(root.findall(f".//{tag}"))
-        if not candidates:
-            candidates = list(root)
-        if not candidates:
-            candidates = [root]
-
-        usertable: Dict[str, Dict[str, List[str]]] = {}
-        counter = 0
-        for node in candidates:
-            leaves: List[Tuple[str, str]] = []
-            for el in node.iter():
-                if list(el):
-                    continue
-                tag = (el.tag or "").lower()
-                text = norm(el.text or "")
-                if not text:
-                    continue
-                leaves.append((tag, text))
-
-            user: Dict[str, List[str]] = {
-                "Nachname": [],
-                "Vorname": [],
-                "E-Mail": [],
-                "Seminar": [],
-                "Gruppe": [],
-                "Kennwort": [],
-                "Datensafe-Kennwort": [],
-                "Typ": [],
-            }
-
-            for tag, text in leaves:
-                low = tag.lower()
-                if any(k in low for k in ("nachname", "lastname", "surname")):
-                    user["Nachname"].append(text)
-                    continue
-                if any(k in low for k in ("vorname", "firstname", "givenname", "given_name")):
-                    user["Vorname"].append(text)
-                    continue
-                if "@" in text:
-                    user["E-Mail"].append(text)
-                if ("kennwort" in low) or ("password" in low):
-                    if ("datensafe" in low) or ("safe" in low):
-                        user["Datensafe-Kennwort"].append(text)
-                    else:
-                        user["Kennwort"].append(text)
-                if ("system" in low) or ("typ" in low) or ("type" in low):
-                    user["Typ"].append(text)
-                if text.startswith("Seminar_"):
-                    user["Seminar"].append(text)
-                if text.startswith("LAA_"):
-                    user["Gruppe"].append(text)
-
-            if not user["Typ"]:
-                user["Typ"].append("LAA" if user["Gruppe"] else "SAB")
-
-            usertable[f'user{counter}'] = user
-            counter += 1
+        leaves: List[Tuple[str, str]] = []
+        for el in node.iter():
+            if list(el):
+                continue
+            tag = (el.tag or "").lower()
+            text = norm(el.text or "")
+            if not text:
+                continue
+            leaves.append((tag, text))
 
-        return usertable
+        user = UserRec()
+
+        for low, text in leaves:
+            if _TAG_LASTNAME_RE.search(low):
+                user.nachname.append(text)
+                continue
+            if _TAG_FIRSTNAME_RE.search(low):
+                user.vorname.append(text)
+                continue
+            seminar, laa, mail = _CELL_RE.match(text).groups()
+            if mail:
+                user.email.append(text)
+            if _TAG_PASSWORD_RE.search(low):
+                if _TAG_SAFE_RE.search(low):
+                    user.datensafe.append(text)
+                else:
+                    user.kennwort.append(text)
+            if _TAG_TYP_RE.search(low):
+                user.typ.append(text)
+            if seminar:
+                user.seminar.append(text)
+            elif laa:
+                user.gruppe.append(text)
+
+        if not user.typ:
+            user.typ.append("LAA" if user.gruppe else "SAB")
+        user.group_key = self._group_key(user)
+
+        return user
 
 
 
@@ -1,10 +1,17 @@
 from dataclasses import dataclass
+import io
+import logging
+import os
 import xml.etree.ElementTree as ET
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
+_log = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Settings:
+    """Unveränderliche Einstellungen; Änderungen über dataclasses.replace()."""
+
     # LEA -> LOGINEO Konverter
     lea_xlsx_file: str
     lea_primary_key: str               # "LEAID" oder "IdentNr"
@@ -37,143 +44,161 @@ class Settings:
     lea_output_format: str = "csv"
 
 
-def _get_text(root: ET.Element, tag: str, default: str = "") -> str:
-    el = root.find(tag)
-    return el.text.strip() if el is not None and el.text is not None else default
+class _ConfigCollector:
+    """
+    Parser-Target für XMLParser: sammelt nur den Text der direkten Kinder von <config>,
+    ohne Element-Objekte anzulegen (erstes Vorkommen eines Tags zählt).
+    """
+
+    def __init__(self) -> None:
+        self.texts: Dict[str, Optional[str]] = {}
+        self.missing = len(_CONFIG_TAGS)
+        self._depth = 0
+        self._buf: list = []
+        self._collecting = False
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        self._depth += 1
+        if self._depth == 2:
+            self._buf = []
+            self._collecting = True
+        else:
+            # Wie Element.text: nur der Text vor dem ersten Unterelement
+            self._collecting = False
+
+    def data(self, data: str) -> None:
+        if self._collecting:
+            self._buf.append(data)
+
+    def end(self, tag: str) -> None:
+        if self._depth == 2 and tag not in self.texts:
+            buf = self._buf
+            self.texts[tag] = "".join(buf).strip() if buf else None
+            if tag in _CONFIG_TAGS:
+                self.missing -= 1
+        self._depth -= 1
+        self._collecting = False
+
+    def close(self) -> Dict[str, Optional[str]]:
+        return self.texts
+
+
+def _read_config_texts(config_path: str) -> Dict[str, Optional[str]]:
+    """
+    Liest die direkten Kinder von <config> blockweise über einen XMLParser mit Target.
+    Sobald alle bekannten Tags gelesen sind, wird der Rest der Datei übersprungen.
+    """
+    target = _ConfigCollector()
+    parser = ET.XMLParser(target=target)
+    with open(config_path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            parser.feed(chunk)
+            if not target.missing:
+                return target.texts
+    return parser.close()
+
+
+def _get_text(texts: Dict[str, Optional[str]], tag: str, default: str = "") -> str:
+    value = texts.get(tag)
+    return default if value is None else value
 
 
 def _warn_invalid(raw: str, varname: str, default: str) -> None:
     # Gewünschte Formulierung:
     # "Ungültiger Wert für X in der config.xml, nutze für Variable Z Standardwert Y"
-    print(f"Ungültiger Wert {raw!r} für Variable {varname!r} in der config.xml. Nutze Standardwert {default!r}")
+    # Ohne konfiguriertes Logging landet die Warnung über logging.lastResort auf stderr
+    _log.warning("Ungültiger Wert %r für Variable %r in der config.xml. Nutze Standardwert %r", raw, varname, default)
 
 
-def _norm_yes_no(value: str, *, varname: str, default_yes: bool) -> str:
-    """
-    Normalisiert eine Ja/Nein-Option:
-    - akzeptiert nur 'ja' oder 'nein' (case-insensitiv)
-    - alles andere -> Default (ja, wenn default_yes=True; sonst nein) + Warnhinweis
-    - Leerer Wert -> Default (ohne Warnhinweis)
-    """
-    v_raw = value or ""
-    v = v_raw.strip().lower()
-    if v == "":
-        return "ja" if default_yes else "nein"
-    if v in ("ja", "nein"):
-        return v
-    default_str = "ja" if default_yes else "nein"
-    _warn_invalid(v_raw, varname, default_str)
-    return default_str
-
-
-def _norm_primary_key(value: str) -> str:
-    """
-    Normalisiert den Primary Key:
-    - akzeptiert 'leaid' oder 'identnr' (case-insensitiv)
-    - alles andere -> 'LEAID' + Warnhinweis (nur wenn nicht leer)
-    - Leerer Wert -> 'LEAID' (ohne Warnhinweis)
-    """
-    v_raw = value or ""
-    v = v_raw.strip().lower()
-    if v == "":
-        return "LEAID"
-    if v == "leaid":
-        return "LEAID"
-    if v == "identnr":
-        return "IdentNr"
-    _warn_invalid(v_raw, "lea_primary_key", "LEAID")
-    return "LEAID"
-
-
-def _norm_output_format(value: str) -> str:
+# Zulässige Eingaben (kleingeschrieben) -> kanonischer Wert
+_YES_NO_MAP = {"ja": "ja", "nein": "nein"}
+_PK_MAP = {"leaid": "LEAID", "identnr": "IdentNr"}
+_FMT_MAP = {"csv": "csv", "xlsx": "xlsx"}
+
+
+def _norm_enum(value: str, mapping: Dict[str, str], default: str, varname: str) -> str:
     """
-    Normalisiert das Ausgabeformat für die LEA-Konvertierung.
-    Erlaubt: 'csv' (Standard) oder 'xlsx'.
+    Normalisiert eine Auswahl-Option (Ja/Nein, Primary Key, Ausgabeformat):
+    - akzeptiert nur die Schlüssel von mapping (case-insensitiv) und liefert deren kanonischen Wert
+    - alles andere -> default + Warnhinweis
+    - Leerer Wert -> default (ohne Warnhinweis)
     """
-    v_raw = value or ""
-    v = v_raw.strip().lower()
-    if v == "":
-        return "csv"
-    if v in ("csv", "xlsx"):
-        return v
-    _warn_invalid(v_raw, "lea_output_format", "csv")
-    return "csv"
+    v = value.strip().lower() if value else ""
+    out = mapping.get(v)
+    if out is not None:  # Normalfall: gültiger Wert
+        return out
+    if v:
+        _warn_invalid(value, varname, default)
+    return default
+
+
+# Aufbau der config.xml: Tag (= Feldname in Settings), zulässige Werte (None = Text übernehmen), Default.
+# Die Reihenfolge ist zugleich die, in der save_settings fehlende Tags anlegt.
+_FIELDS: Tuple[Tuple[str, Optional[Dict[str, str]], str], ...] = (
+    # LEA
+    ("lea_xlsx_file",                 None, ""),
+    ("lea_primary_key",               _PK_MAP, "LEAID"),
+    ("lea_gruppe_laa_lehramt",        _YES_NO_MAP, "ja"),
+    ("lea_gruppe_laa_lehramt_jg",     _YES_NO_MAP, "ja"),
+    ("lea_gruppe_laa_seminare",       _YES_NO_MAP, "ja"),
+    ("lea_outputpath",                None, "output"),
+    ("lea_output_format",             _FMT_MAP, "csv"),
+    # PDF
+    ("logineo_csv_file",              None, ""),
+    ("logineo_xml_file",              None, ""),
+    ("logineo_csv_delimiter",         None, ","),
+    ("pdf_outputpath",                None, "pdf-files"),
+    ("pdf_logineolink",               None, ""),
+    ("pdf_supportname",               None, ""),
+    ("pdf_supportmail",               None, ""),
+    # (Optional) Auch PDF-Flags robust normalisieren + warnen
+    ("pdf_einzeln",                   _YES_NO_MAP, "ja"),
+    ("pdf_lehramt",                   _YES_NO_MAP, "nein"),
+    # XML Tag-Mapping (optional)
+    ("logineo_xml_user_tag",          None, ""),
+    ("logineo_xml_tag_lastname",      None, ""),
+    ("logineo_xml_tag_firstname",     None, ""),
+    ("logineo_xml_tag_email",         None, ""),
+    ("logineo_xml_tag_password",      None, ""),
+    ("logineo_xml_tag_safe_password", None, ""),
+    ("logineo_xml_tag_system",        None, ""),
+    ("logineo_xml_tag_group",         None, ""),
+)
+
+# Alle Tags, die load_settings aus der config.xml liest
+_CONFIG_TAGS = frozenset(name for name, _mapping, _default in _FIELDS)
+
+
+# config_path -> ((mtime_ns, Größe), Settings); Settings ist unveränderlich und darf geteilt werden
+_CACHE: Dict[str, Tuple[Tuple[int, int], Settings]] = {}
 
 
 def load_settings(config_path: str) -> Settings:
-    with open(config_path, "r", encoding="utf-8") as f:
-        xml_text = f.read()
+    # Unveränderte Datei (gleiche mtime und Größe) nicht erneut parsen
+    st = os.stat(config_path)
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _CACHE.get(config_path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+
     # Parse XML using ElementTree (keine bs4-Abhängigkeit)
-    root = ET.fromstring(xml_text)
-
-    # Rohwerte auslesen
-    lea_xlsx_file          = _get_text(root, "lea_xlsx_file")
-    lea_primary_key_raw    = _get_text(root, "lea_primary_key", "LEAID")
-    laa_lehramt_raw        = _get_text(root, "lea_gruppe_laa_lehramt", "ja")
-    laa_jg_raw             = _get_text(root, "lea_gruppe_laa_lehramt_jg", "ja")
-    laa_seminare_raw       = _get_text(root, "lea_gruppe_laa_seminare", "ja")
-    lea_outputpath         = _get_text(root, "lea_outputpath", "output")
-    lea_output_format_raw  = _get_text(root, "lea_output_format", "csv")
-
-    logineo_csv_file       = _get_text(root, "logineo_csv_file")
-    logineo_xml_file       = _get_text(root, "logineo_xml_file", "")
-    logineo_csv_delimiter  = _get_text(root, "logineo_csv_delimiter", ",")
-    # XML-Tag-Mapping (optional)
-    logineo_xml_user_tag         = _get_text(root, "logineo_xml_user_tag")
-    logineo_xml_tag_lastname     = _get_text(root, "logineo_xml_tag_lastname")
-    logineo_xml_tag_firstname    = _get_text(root, "logineo_xml_tag_firstname")
-    logineo_xml_tag_email        = _get_text(root, "logineo_xml_tag_email")
-    logineo_xml_tag_password     = _get_text(root, "logineo_xml_tag_password")
-    logineo_xml_tag_safe_password= _get_text(root, "logineo_xml_tag_safe_password")
-    logineo_xml_tag_system       = _get_text(root, "logineo_xml_tag_system")
-    logineo_xml_tag_group        = _get_text(root, "logineo_xml_tag_group")
-    pdf_outputpath         = _get_text(root, "pdf_outputpath", "pdf-files")
-    pdf_logineolink        = _get_text(root, "pdf_logineolink")
-    pdf_supportname        = _get_text(root, "pdf_supportname")
-    pdf_supportmail        = _get_text(root, "pdf_supportmail")
-    pdf_einzeln_raw        = _get_text(root, "pdf_einzeln", "ja")
-    pdf_lehramt_raw        = _get_text(root, "pdf_lehramt", "nein")
-
-    # Normalisieren mit Warnhinweisen wo nötig
-    lea_primary_key            = _norm_primary_key(lea_primary_key_raw)
-    lea_gruppe_laa_lehramt     = _norm_yes_no(laa_lehramt_raw,      varname="lea_gruppe_laa_lehramt",    default_yes=True)
-    lea_gruppe_laa_lehramt_jg  = _norm_yes_no(laa_jg_raw,           varname="lea_gruppe_laa_lehramt_jg", default_yes=True)
-    lea_gruppe_laa_seminare    = _norm_yes_no(laa_seminare_raw,     varname="lea_gruppe_laa_seminare",   default_yes=True)
-    lea_output_format          = _norm_output_format(lea_output_format_raw)
+    texts = _read_config_texts(config_path)
 
-    # (Optional) Auch PDF-Flags robust normalisieren + warnen
-    pdf_einzeln                = _norm_yes_no(pdf_einzeln_raw,      varname="pdf_einzeln",               default_yes=True)
-    pdf_lehramt                = _norm_yes_no(pdf_lehramt_raw,      varname="pdf_lehramt",               default_yes=False)
-
-    return Settings(
-        # LEA
-        lea_xlsx_file=lea_xlsx_file,
-        lea_primary_key=lea_primary_key,
-        lea_gruppe_laa_lehramt=lea_gruppe_laa_lehramt,
-        lea_gruppe_laa_lehramt_jg=lea_gruppe_laa_lehramt_jg,
-        lea_gruppe_laa_seminare=lea_gruppe_laa_seminare,
-        lea_outputpath=lea_outputpath,
-        lea_output_format=lea_output_format,
-        # PDF
-        logineo_csv_file=logineo_csv_file,
-        logineo_xml_file=(logineo_xml_file or ""),
-        logineo_csv_delimiter=logineo_csv_delimiter,
-        pdf_outputpath=pdf_outputpath,
-        pdf_logineolink=pdf_logineolink,
-        pdf_supportname=pdf_supportname,
-        pdf_supportmail=pdf_supportmail,
-        pdf_einzeln=pdf_einzeln,
-        pdf_lehramt=pdf_lehramt,
-        # XML Tag-Mapping
-        logineo_xml_user_tag=logineo_xml_user_tag,
-        logineo_xml_tag_lastname=logineo_xml_tag_lastname,
-        logineo_xml_tag_firstname=logineo_xml_tag_firstname,
-        logineo_xml_tag_email=logineo_xml_tag_email,
-        logineo_xml_tag_password=logineo_xml_tag_password,
-        logineo_xml_tag_safe_password=logineo_xml_tag_safe_password,
-        logineo_xml_tag_system=logineo_xml_tag_system,
-        logineo_xml_tag_group=logineo_xml_tag_group,
-    )
+    # Rohwerte auslesen und mit Warnhinweisen normalisieren, wo nötig
+    values: Dict[str, str] = {}
+    for name, mapping, default in _FIELDS:
+        raw = _get_text(texts, name, default)
+        values[name] = _norm_enum(raw, mapping, default, name) if mapping is not None else raw
+    settings = Settings(**values)
+    _CACHE[config_path] = (key, settings)
+    return settings
+
+
+load_settings.cache_clear = _CACHE.clear  # type: ignore[attr-defined]
+
+
+# Tag-Namen in der config.xml entsprechen den Feldnamen von Settings (Reihenfolge aus _FIELDS)
+_SAVE_FIELDS = tuple(name for name, _mapping, _default in _FIELDS)
 
 
 def save_settings(config_path: str, s: Settings) -> None:
@@ -181,6 +206,7 @@ def save_settings(config_path: str, s: Settings) -> None:
 
     - Erhält vorhandene Kommentare und Reihenfolge, sofern die Tags existieren.
     - Legt fehlende Tags bei Bedarf neu an.
+    - Schreibt nur, wenn sich der Inhalt ändert; dann atomar über eine .part-Datei.
     """
     try:
         tree = ET.parse(config_path)
@@ -190,40 +216,29 @@ def save_settings(config_path: str, s: Settings) -> None:
         root = ET.Element("config")
         tree = ET.ElementTree(root)
 
-    def set_text(tag: str, value: Optional[str]) -> None:
-        el = root.find(tag)
+    # Vorhandene Tags einmal einsammeln (wie find(): erstes Vorkommen gewinnt)
+    existing: Dict[str, ET.Element] = {}
+    for child in root:
+        existing.setdefault(child.tag, child)
+
+    for name in _SAVE_FIELDS:
+        el = existing.get(name)
         if el is None:
-            el = ET.SubElement(root, tag)
-        el.text = (value or "")
+            el = existing[name] = ET.SubElement(root, name)
+        el.text = (getattr(s, name) or "")
 
-    # LEA
-    set_text("lea_xlsx_file", s.lea_xlsx_file)
-    set_text("lea_primary_key", s.lea_primary_key)
-    set_text("lea_gruppe_laa_lehramt", s.lea_gruppe_laa_lehramt)
-    set_text("lea_gruppe_laa_lehramt_jg", s.lea_gruppe_laa_lehramt_jg)
-    set_text("lea_gruppe_laa_seminare", s.lea_gruppe_laa_seminare)
-    set_text("lea_outputpath", s.lea_outputpath)
-    set_text("lea_output_format", s.lea_output_format)
-
-    # LOGINEO / PDF
-    set_text("logineo_csv_file", s.logineo_csv_file)
-    set_text("logineo_xml_file", s.logineo_xml_file)
-    set_text("logineo_csv_delimiter", s.logineo_csv_delimiter)
-    set_text("pdf_outputpath", s.pdf_outputpath)
-    set_text("pdf_logineolink", s.pdf_logineolink)
-    set_text("pdf_supportname", s.pdf_supportname)
-    set_text("pdf_supportmail", s.pdf_supportmail)
-    set_text("pdf_einzeln", s.pdf_einzeln)
-    set_text("pdf_lehramt", s.pdf_lehramt)
-
-    # XML-Mapping (optional)
-    set_text("logineo_xml_user_tag", s.logineo_xml_user_tag)
-    set_text("logineo_xml_tag_lastname", s.logineo_xml_tag_lastname)
-    set_text("logineo_xml_tag_firstname", s.logineo_xml_tag_firstname)
-    set_text("logineo_xml_tag_email", s.logineo_xml_tag_email)
-    set_text("logineo_xml_tag_password", s.logineo_xml_tag_password)
-    set_text("logineo_xml_tag_safe_password", s.logineo_xml_tag_safe_password)
-    set_text("logineo_xml_tag_system", s.logineo_xml_tag_system)
-    set_text("logineo_xml_tag_group", s.logineo_xml_tag_group)
-
-    tree.write(config_path, encoding="utf-8", xml_declaration=False)
+    buf = io.BytesIO()
+    tree.write(buf, encoding="utf-8", xml_declaration=False)
+    data = buf.getvalue()
+    try:
+        with open(config_path, "rb") as f:
+            if f.read() == data:
+                return
+    except OSError:
+        pass  # Datei fehlt/nicht lesbar -> neu schreiben
+
+    part_path = config_path + ".part"
+    with open(part_path, "wb") as f:
+        f.write(data)
+    os.replace(part_path, config_path)
+    _CACHE.pop(config_path, None)
@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def make_settings(tmp_path):
+    """Settings mit Ausgabeordnern unter tmp_path; Felder per Keyword überschreibbar."""
+    from modules.settings import Settings
+
+    def make(**overrides):
+        values = dict(
+            lea_xlsx_file="",
+            lea_primary_key="LEAID",
+            lea_gruppe_laa_lehramt="ja",
+            lea_gruppe_laa_lehramt_jg="ja",
+            lea_gruppe_laa_seminare="ja",
+            lea_outputpath=str(tmp_path / "lea-out"),
+            logineo_csv_file="",
+            logineo_xml_file="",
+            pdf_outputpath=str(tmp_path / "pdf-out"),
+        )
+        values.update(overrides)
+        return Settings(**values)
+
+    return make
+
+
+@pytest.fixture
+def pdfgen(make_settings, tmp_path, monkeypatch):
+    """PDFGenerator ohne Rückfragen, dessen tmp-Ordner unter tmp_path liegt."""
+    pytest.importorskip("reportlab")
+    from modules import pdf_generator
+
+    resolve = pdf_generator.resolve_path
+    monkeypatch.setattr(
+        pdf_generator, "resolve_path",
+        lambda p: str(tmp_path / "tmp") if p == "tmp" else resolve(p),
+    )
+
+    def make(**overrides):
+        return pdf_generator.PDFGenerator(make_settings(**overrides), log=lambda _msg: None, interactive=False)
+
+    return make
@@ -0,0 +1,82 @@
+import glob
+import os
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from conftest import ROOT
+from modules.converter import LEAConverter, _read_source
+
+DATA = os.path.join(ROOT, "tests", "data")
+
+
+def _convert(settings) -> dict:
+    """Führt die Konvertierung ohne Rückfragen aus; liefert {Dateiendung: Pfad} der Ausgaben."""
+    LEAConverter(settings, log=lambda _msg: None, interactive=False).convert()
+    out = {}
+    for path in glob.glob(os.path.join(settings.lea_outputpath, "*")):
+        key = "fehler" if path.endswith("_FEHLER.xlsx") else os.path.splitext(path)[1]
+        out[key] = path
+    return out
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+# Erwartete Ausgaben in tests/data wurden mit der ursprünglichen zeilenweisen Implementierung erzeugt
+@pytest.mark.parametrize("primary, gruppen, expected", [
+    ("LEAID", "ja", "referendare_LEAID_alle_Gruppen.csv"),
+    ("IdentNr", "nein", "referendare_IdentNr_ohne_Gruppen.csv"),
+])
+def test_convert_sample_export_matches_baseline(make_settings, primary, gruppen, expected):
+    s = make_settings(
+        lea_xlsx_file=os.path.join(ROOT, "Beispiel_LEA-Ausgabe_LAA.xlsx"),
+        lea_primary_key=primary,
+        lea_gruppe_laa_lehramt=gruppen,
+        lea_gruppe_laa_lehramt_jg=gruppen,
+        lea_gruppe_laa_seminare=gruppen,
+    )
+    out = _convert(s)
+
+    assert sorted(out) == [".csv"]
+    assert _read_bytes(out[".csv"]) == _read_bytes(os.path.join(DATA, expected))
+
+
+def test_convert_with_invalid_rows_matches_baseline(make_settings):
+    s = make_settings(lea_xlsx_file=os.path.join(DATA, "lea_mit_fehlern.xlsx"))
+    out = _convert(s)
+
+    assert sorted(out) == [".csv", "fehler"]
+    assert _read_bytes(out[".csv"]) == _read_bytes(os.path.join(DATA, "referendare_mit_fehlern.csv"))
+    errors = pd.read_excel(out["fehler"], dtype=str, na_filter=False)
+    expected = pd.read_csv(os.path.join(DATA, "referendare_FEHLER.csv"), dtype=str,
+                           keep_default_na=False, encoding="utf-8-sig")
+    pd.testing.assert_frame_equal(errors, expected)
+
+
+def test_convert_xlsx_output_has_same_rows_as_csv(make_settings):
+    s = make_settings(
+        lea_xlsx_file=os.path.join(ROOT, "Beispiel_LEA-Ausgabe_LAA.xlsx"),
+        lea_output_format="xlsx",
+    )
+    out = _convert(s)
+
+    assert sorted(out) == [".xlsx"]
+    got = pd.read_excel(out[".xlsx"], dtype=str, na_filter=False)
+    expected = pd.read_csv(os.path.join(DATA, "referendare_LEAID_alle_Gruppen.csv"), dtype=str,
+                           keep_default_na=False, encoding="utf-8-sig")
+    pd.testing.assert_frame_equal(got, expected)
+
+
+@pytest.mark.parametrize("encoding", ["utf-8-sig", "utf-8", "cp1252"])
+def test_read_source_csv_encodings(tmp_path, encoding):
+    path = tmp_path / "lea.csv"
+    path.write_text("LAA_Name;LAA_Vorname;Lehramt;Sonstiges\nMüller;Jörg;G;x\n", encoding=encoding)
+
+    df = _read_source(str(path))
+
+    assert list(df.columns) == ["LAA_Name", "LAA_Vorname", "Lehramt"]
+    assert df.to_dict("records") == [{"LAA_Name": "Müller", "LAA_Vorname": "Jörg", "Lehramt": "G"}]
@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+pytest.importorskip("tkinter")
+pytest.importorskip("openpyxl")
+
+from conftest import ROOT
+from modules import gui
+
+
+def _rows(path):
+    # Wie beim CSV-Export: komplett leere Zeilen fallen weg
+    return [row for row in gui._iter_sheet_rows(path) if any(row)]
+
+
+@pytest.fixture
+def workbook_with_offset(tmp_path):
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws["C3"], ws["D3"] = "Nachname", "Vorname"
+    ws["C4"], ws["D4"] = "Müller", 12.0
+    ws["C6"] = "Becker"
+    path = tmp_path / "versetzt.xlsx"
+    wb.save(path)
+    return str(path)
+
+
+@pytest.mark.parametrize("name", [
+    "Beispiel_LOGINEO-Ausgabe_LAA.xls",
+    "Beispiel_LOGINEO-Ausgabe_SAB.xls",
+    "Beispiel_LEA-Ausgabe_LAA.xlsx",
+    None,
+])
+def test_calamine_rows_match_fallback_reader(monkeypatch, workbook_with_offset, name):
+    calamine = pytest.importorskip("python_calamine")
+    if name and name.endswith(".xls"):
+        pytest.importorskip("xlrd")
+    path = os.path.join(ROOT, name) if name else workbook_with_offset
+
+    monkeypatch.setattr(gui, "CalamineWorkbook", calamine.CalamineWorkbook)
+    with_calamine = _rows(path)
+    monkeypatch.setattr(gui, "CalamineWorkbook", None)
+    fallback = _rows(path)
+
+    assert with_calamine == fallback
+    assert with_calamine
+
+
+def test_fallback_keeps_leading_empty_columns(monkeypatch, workbook_with_offset):
+    monkeypatch.setattr(gui, "CalamineWorkbook", None)
+
+    assert _rows(workbook_with_offset) == [
+        ["", "", "Nachname", "Vorname"],
+        ["", "", "Müller", "12"],
+        ["", "", "Becker", ""],
+    ]
@@ -0,0 +1,113 @@
+import os
+
+from conftest import ROOT
+
+
+def test_rows_to_usertable_scans_duplicate_columns(pdfgen):
+    gen = pdfgen()
+    header = ["Nachname", "Vorname", "E-Mailadresse", "E-Mailadresse", "E-Mailadresse",
+              "Fachbereich", "Gruppe", "Gruppe", "Gruppe", "System", "Kennwort"]
+    rows = [
+        ["Fischer", "Marie", "a@x.de", "b@x.de", "", "Seminar_GyGe", "LAA_GyGe", "", "LAA_GyGe_2023-11", "LAA", "pw1"],
+        ["Ohne", "Kennwort", "c@x.de", "", "", "Seminar_G", "", "", "", "SAB", ""],
+    ]
+    users = gen._rows_to_usertable(header, rows)
+
+    assert len(users) == 1
+    u = users[0]
+    assert u.nachname == ["Fischer"]
+    assert u.email == ["a@x.de", "b@x.de"]
+    assert u.seminar == ["Seminar_GyGe"]
+    assert u.gruppe == ["LAA_GyGe", "LAA_GyGe_2023-11"]
+    assert u.kennwort == ["pw1"]
+    assert u.typ == ["LAA"]
+    assert u.group_key == ("LAA", "GyGe")
+
+
+def test_read_csv_sample_export_keeps_all_addresses(pdfgen):
+    gen = pdfgen()
+    users = gen._read_csv_to_usertable(os.path.join(ROOT, "Beispiel_LOGINEO-Ausgabe_LAA.csv"))
+
+    assert users
+    for u in users:
+        assert u.kennwort and u.kennwort[0]
+        assert all("@" in m for m in u.email)
+    # Jede Person hat in der Beispieldatei zwei E-Mail-Adressen in getrennten Spalten
+    assert all(len(u.email) == 2 for u in users)
+
+
+def test_read_xml_nested_records_keep_inner_leaves(pdfgen, tmp_path):
+    xml_path = tmp_path / "nested.xml"
+    xml_path.write_text(
+        "<users>"
+        "<user><nachname>Fischer</nachname><vorname>Marie</vorname>"
+        "<account><email>marie@x.de</email><password>pw1</password><gruppe>LAA_GyGe</gruppe></account>"
+        "</user>"
+        "<user><nachname>Worms</nachname><email>katja@x.de</email><password>pw2</password></user>"
+        "</users>",
+        encoding="utf-8",
+    )
+    users = pdfgen()._read_xml_to_usertable(str(xml_path))
+
+    # Wie findall(".//tag") je Tag: erst alle <user>, dann alle <account>
+    assert [(u.nachname, u.email, u.kennwort) for u in users] == [
+        (["Fischer"], ["marie@x.de"], ["pw1"]),
+        (["Worms"], ["katja@x.de"], ["pw2"]),
+        ([], ["marie@x.de"], ["pw1"]),
+    ]
+    assert users[0].gruppe == ["LAA_GyGe"]
+    assert users[0].typ == ["LAA"]
+    assert users[1].typ == ["SAB"]
+
+
+def test_read_xml_without_record_tags_uses_root_children(pdfgen, tmp_path):
+    xml_path = tmp_path / "flat.xml"
+    xml_path.write_text(
+        "<export><eintragung><nachname>A</nachname><kennwort>p</kennwort></eintragung>"
+        "<eintragung><nachname>B</nachname><kennwort>q</kennwort></eintragung></export>",
+        encoding="utf-8",
+    )
+    users = pdfgen()._read_xml_to_usertable(str(xml_path))
+
+    assert [u.nachname for u in users] == [["A"], ["B"]]
+
+
+def _render_jobs_logged(gen, tmp_path, count):
+    users = gen._read_csv_to_usertable(os.path.join(ROOT, "Beispiel_LOGINEO-Ausgabe_LAA.csv"))
+    jobs = [([users[i % len(users)]], str(tmp_path / f"{i}.pdf"), None, "Footer") for i in range(count)]
+    seen = []
+    # Zu jeder Meldung festhalten, welche PDFs da schon auf der Platte liegen
+    gen._log = lambda msg: seen.append((msg, [os.path.exists(j[1]) for j in jobs]))
+    gen._render_jobs(jobs)
+    return jobs, seen
+
+
+def test_render_jobs_serial_logs_each_pdf_after_it_is_written(pdfgen, tmp_path):
+    gen = pdfgen()
+    gen._parallel = False
+    jobs, seen = _render_jobs_logged(gen, tmp_path, 2)
+
+    assert [msg for msg, _ in seen] == ["Erstellt: " + j[1] for j in jobs]
+    assert [exists for _, exists in seen] == [[True, False], [True, True]]
+    assert all(os.path.getsize(j[1]) > 0 for j in jobs)
+
+
+def test_render_jobs_parallel_uses_pool(pdfgen, tmp_path, monkeypatch):
+    from modules import pdf_generator
+
+    # Auch auf Maschinen mit einem Kern den Pool-Weg nehmen
+    monkeypatch.setattr(pdf_generator.os, "cpu_count", lambda: 2)
+    gen = pdfgen()
+    assert gen._parallel
+
+    def render_here(*_args):
+        raise AssertionError("PDF wurde im Hauptprozess gerendert")
+
+    # Rendern die Worker, wird der Renderer dieses Prozesses nie aufgerufen
+    monkeypatch.setattr(gen, "_render_pdf", render_here)
+    jobs, seen = _render_jobs_logged(gen, tmp_path, pdf_generator._PARALLEL_MIN_JOBS)
+
+    assert [msg for msg, _ in seen] == ["Erstellt: " + j[1] for j in jobs]
+    for i, (_, exists) in enumerate(seen):
+        assert all(exists[: i + 1])
+    assert all(os.path.getsize(j[1]) > 0 for j in jobs)
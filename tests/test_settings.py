@@ -0,0 +1,128 @@
+import logging
+import os
+import xml.etree.ElementTree as ET
+from dataclasses import fields, replace
+
+from conftest import ROOT
+from modules.settings import Settings, _SAVE_FIELDS, load_settings, save_settings
+
+
+def _write(tmp_path, body: str, name: str = "config.xml") -> str:
+    path = tmp_path / name
+    path.write_text(body, encoding="utf-8")
+    return str(path)
+
+
+def test_text_before_first_subelement_is_kept(tmp_path):
+    path = _write(tmp_path, "<config><pdf_supportname>A<x>y</x>B</pdf_supportname></config>")
+
+    assert load_settings(path).pdf_supportname == "A"
+
+
+def test_config_fields_cover_settings():
+    # _FIELDS (und damit _SAVE_FIELDS) ist die einzige Liste der config-Tags
+    assert sorted(_SAVE_FIELDS) == sorted(f.name for f in fields(Settings))
+    assert len(set(_SAVE_FIELDS)) == len(_SAVE_FIELDS)
+
+
+def test_save_creates_missing_tags_in_save_order(make_settings, tmp_path):
+    path = _write(tmp_path, "<config><pdf_lehramt>ja</pdf_lehramt></config>")
+
+    save_settings(path, make_settings())
+
+    tags = [child.tag for child in ET.parse(path).getroot()]
+    # Vorhandene Tags bleiben an ihrer Stelle, neue folgen in fester Reihenfolge
+    assert tags == ["pdf_lehramt"] + [t for t in _SAVE_FIELDS if t != "pdf_lehramt"]
+    assert tags[1:8] == [
+        "lea_xlsx_file", "lea_primary_key", "lea_gruppe_laa_lehramt", "lea_gruppe_laa_lehramt_jg",
+        "lea_gruppe_laa_seminare", "lea_outputpath", "lea_output_format",
+    ]
+
+
+def test_sample_config_loads_without_warnings(caplog):
+    s = load_settings(os.path.join(ROOT, "config.xml"))
+
+    assert s.lea_primary_key in ("LEAID", "IdentNr")
+    assert not caplog.records
+
+
+def test_missing_and_empty_tags_use_defaults(tmp_path):
+    path = _write(tmp_path, "<config><lea_outputpath></lea_outputpath><pdf_einzeln/></config>")
+
+    s = load_settings(path)
+
+    assert s.lea_outputpath == "output"
+    assert s.pdf_einzeln == "ja"
+    assert s.pdf_lehramt == "nein"
+    assert s.lea_primary_key == "LEAID"
+    assert s.lea_output_format == "csv"
+    assert s.logineo_csv_delimiter == ","
+    assert s.pdf_outputpath == "pdf-files"
+
+
+def test_choices_are_normalized_and_invalid_values_warn(tmp_path, caplog):
+    path = _write(
+        tmp_path,
+        "<config><lea_primary_key> identnr </lea_primary_key><pdf_einzeln>NEIN</pdf_einzeln>"
+        "<lea_output_format>XLSX</lea_output_format><lea_gruppe_laa_seminare>vielleicht</lea_gruppe_laa_seminare>"
+        "</config>",
+    )
+
+    with caplog.at_level(logging.WARNING, logger="modules.settings"):
+        s = load_settings(path)
+
+    assert s.lea_primary_key == "IdentNr"
+    assert s.pdf_einzeln == "nein"
+    assert s.lea_output_format == "xlsx"
+    assert s.lea_gruppe_laa_seminare == "ja"
+    assert len(caplog.records) == 1
+    assert "lea_gruppe_laa_seminare" in caplog.records[0].getMessage()
+
+
+def test_save_and_load_round_trip(make_settings, tmp_path):
+    path = str(tmp_path / "config.xml")
+    s = make_settings(
+        lea_primary_key="IdentNr",
+        lea_output_format="xlsx",
+        logineo_csv_delimiter=";",
+        pdf_supportname="Müller & Söhne <Support>",
+        pdf_einzeln="nein",
+        logineo_xml_tag_group="gruppe",
+    )
+
+    save_settings(path, s)
+
+    assert load_settings(path) == s
+    assert not os.path.exists(path + ".part")
+
+
+def test_save_replaces_broken_file(make_settings, tmp_path):
+    path = _write(tmp_path, "<config><lea_xlsx_file>kaputt")
+
+    save_settings(path, make_settings())
+
+    assert [child.tag for child in ET.parse(path).getroot()] == list(_SAVE_FIELDS)
+
+
+def test_save_keeps_unknown_tags_and_skips_unchanged_write(make_settings, tmp_path):
+    path = _write(tmp_path, "<config><eigenes>bleibt</eigenes></config>")
+    s = make_settings()
+    save_settings(path, s)
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+
+    save_settings(path, s)
+
+    assert os.stat(path).st_mtime_ns == 1_000_000_000
+    assert ET.parse(path).getroot().findtext("eigenes") == "bleibt"
+
+
+def test_load_is_cached_until_the_file_changes(make_settings, tmp_path):
+    path = str(tmp_path / "config.xml")
+    save_settings(path, make_settings(pdf_supportname="A"))
+    first = load_settings(path)
+
+    assert load_settings(path) is first
+
+    save_settings(path, replace(first, pdf_supportname="Bernd"))
+
+    assert load_settings(path).pdf_supportname == "Bernd"